@@ -1,25 +1,38 @@
 import tkinter as tk
 from tkinter import ttk
 import math
-import can
+
+import numpy as np
 
 from can_reading import CANBusReader
+from can_transmit import TransmitScheduler
+
+CUBE_VERTICES = np.array([
+    [-1, -1, -1], [1, -1, -1], [1, 1, -1], [-1, 1, -1],
+    [-1, -1, 1], [1, -1, 1], [1, 1, 1], [-1, 1, 1]
+], dtype=float)
+
+CUBE_FACES = np.array([
+    [0, 1, 2, 3], [4, 5, 6, 7], [0, 4, 7, 3],
+    [1, 5, 6, 2], [0, 1, 5, 4], [3, 2, 6, 7]
+])
+
+CUBE_COLORS = ['#00d4ff', '#0096B4', '#0074D3', '#005A8F', '#004170', '#002851']
+
+CUBE_SCALE = 80
 
 class AccelerationPage(tk.Frame):
-    def __init__(self, parent):
+    def __init__(self, parent, reader=None, motor_rate=20):
         super().__init__(parent, bg='#0a0a0a')
         self.accel = [0, 0, 0]
         self.rotation = [0, 0, 0]
         self.motor_speed = 0  # Variable pour stocker la vitesse du moteur
-        self.reader = CANBusReader
+        self.reader = reader if reader is not None else CANBusReader()
+        self.transmitter = TransmitScheduler(self.reader, max_rate=motor_rate)
+        self.dirty = True
+        self.cube_faces = []
+        self._drawn_state = None
         self.create_widgets()
-        self.update_rotation()
-
-        try:
-            self.bus = can.interface.Bus('can0', bustype='socketcan')
-        except Exception as e:
-            print(f"CAN init error: {e}")
-            self.bus = None
 
     def create_widgets(self):
         main_frame = tk.Frame(self, bg='#0a0a0a')
@@ -138,26 +151,42 @@ class AccelerationPage(tk.Frame):
         self.cube_canvas = tk.Canvas(visualization_frame, width=500, height=500, bg='#070707', 
                                     highlightthickness=2, highlightbackground='#00d4ff')
         self.cube_canvas.pack(expand=True, pady=20)
+        self.cube_canvas.bind('<Configure>', self._on_resize)
+
+    def _on_resize(self, event):
+        self.dirty = True
 
     def _on_motor_speed_change(self, value):
         try:
             id = 0x03
             data = [int(value), 0, 0, 1, 3, 1, 4, 1]
             speed = hex(int(value))
-            self.reader.send_message(self, id, data)
+            self.transmitter.submit(id, data)
             print(f"Commanding motor speed: {speed}")
         except ValueError:
             pass
 
     def set_accel(self, x, y, z):
-        self.accel = [x, y, z]
+        if [x, y, z] != self.accel:
+            self.accel = [x, y, z]
+            self.dirty = True
+
+    def render(self):
+        self.dirty = False
+        self.update_rotation()
 
     def update_rotation(self):
         ax, ay, az = self.accel
         self.rotation[0] = ax * 2
         self.rotation[1] = ay * 2
         self.rotation[2] = az * 2
-        
+
+        # Rien à redessiner si les angles et la taille du canevas n'ont pas changé
+        state = (tuple(self.rotation), self.cube_canvas.winfo_width(), self.cube_canvas.winfo_height())
+        if state == self._drawn_state:
+            return
+        self._drawn_state = state
+
         self.draw_modern_cube()
         
         self.alpha_label.config(text=f"{ax:.2f}")
@@ -165,70 +194,39 @@ class AccelerationPage(tk.Frame):
         self.psi_label.config(text=f"{az:.2f}")
 
         self.anemo_label.config(text=f"{az:.2f}")
-        
-        self.after(30, self.update_rotation)
 
     def draw_modern_cube(self):
-        self.cube_canvas.delete("all")
-        
         width = self.cube_canvas.winfo_width()
         height = self.cube_canvas.winfo_height()
         center_x, center_y = width // 2, height // 2
-        
-        vertices = [
-            [-1, -1, -1], [1, -1, -1], [1, 1, -1], [-1, 1, -1],
-            [-1, -1, 1], [1, -1, 1], [1, 1, 1], [-1, 1, 1]
-        ]
-        
-        projected = []
-        for vertex in vertices:
-            x, y, z = vertex
-            
-            x, y, z = self.rotate_x(x, y, z, self.rotation[0])
-            x, y, z = self.rotate_y(x, y, z, self.rotation[1])
-            x, y, z = self.rotate_z(x, y, z, self.rotation[2])
-            
-            scale = 80
-            x_proj = x * scale + center_x
-            y_proj = y * scale + center_y
-            
-            projected.append((x_proj, y_proj, z))
-        
-        faces = [
-            [0, 1, 2, 3], [4, 5, 6, 7], [0, 4, 7, 3],
-            [1, 5, 6, 2], [0, 1, 5, 4], [3, 2, 6, 7]
-        ]
-        
-        colors = ['#00d4ff', '#0096B4', '#0074D3', '#005A8F', '#004170', '#002851']
-        
-        for i, face in enumerate(faces):
-            points = []
-            avg_z = 0
-            for vertex_idx in face:
-                points.extend(projected[vertex_idx][:2])
-                avg_z += projected[vertex_idx][2]
-            avg_z /= len(face)
-            
-            self.cube_canvas.create_polygon(points, fill=colors[i], outline='#ffffff', width=2, 
-                                          stipple='gray50' if i % 2 == 0 else '')
-
-    def rotate_x(self, x, y, z, angle):
-        rad = math.radians(angle)
-        cos_a, sin_a = math.cos(rad), math.sin(rad)
-        y_new = y * cos_a - z * sin_a
-        z_new = y * sin_a + z * cos_a
-        return x, y_new, z_new
-
-    def rotate_y(self, x, y, z, angle):
-        rad = math.radians(angle)
-        cos_a, sin_a = math.cos(rad), math.sin(rad)
-        x_new = x * cos_a + z * sin_a
-        z_new = -x * sin_a + z * cos_a
-        return x_new, y, z_new
-
-    def rotate_z(self, x, y, z, angle):
-        rad = math.radians(angle)
-        cos_a, sin_a = math.cos(rad), math.sin(rad)
-        x_new = x * cos_a - y * sin_a
-        y_new = x * sin_a + y * cos_a
-        return x_new, y_new, z
\ No newline at end of file
+
+        if not self.cube_faces:
+            # Les 6 faces sont créées une seule fois puis déplacées avec coords()
+            self.cube_faces = [
+                self.cube_canvas.create_polygon(0, 0, 0, 0, 0, 0, fill=color, outline='#ffffff', width=2,
+                                                stipple='gray50' if i % 2 == 0 else '')
+                for i, color in enumerate(CUBE_COLORS)
+            ]
+
+        # Même ordre que l'ancien rotate_x puis rotate_y puis rotate_z : R = Rz · Ry · Rx
+        rotated = CUBE_VERTICES @ rotation_matrix(*self.rotation).T
+        projected = rotated[:, :2] * CUBE_SCALE + (center_x, center_y)
+        depths = rotated[CUBE_FACES, 2].mean(axis=1)
+
+        for item, face in zip(self.cube_faces, CUBE_FACES):
+            self.cube_canvas.coords(item, *projected[face].ravel().tolist())
+
+        # Algorithme du peintre : la face la plus proche (z le plus petit) est remontée en dernier
+        for index in depths.argsort()[::-1]:
+            self.cube_canvas.tag_raise(self.cube_faces[index])
+
+
+def rotation_matrix(alpha, theta, psi):
+    a, t, p = np.radians((alpha, theta, psi))
+    ca, sa = math.cos(a), math.sin(a)
+    ct, st = math.cos(t), math.sin(t)
+    cp, sp = math.cos(p), math.sin(p)
+    rx = np.array([[1, 0, 0], [0, ca, -sa], [0, sa, ca]])
+    ry = np.array([[ct, 0, st], [0, 1, 0], [-st, 0, ct]])
+    rz = np.array([[cp, -sp, 0], [sp, cp, 0], [0, 0, 1]])
+    return rz @ ry @ rx
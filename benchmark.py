@@ -0,0 +1,223 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+import can
+
+from can_connection import BusConnection
+from can_reading import CANBusReader
+
+BENCH_CHANNEL = 'benchmark'
+
+SAMPLE_FRAMES = {
+    0x03: [42, 0, 0, 1, 3, 1, 4, 1],
+    0x11: [0, 0, 0x01, 0xF4, 0, 0, 0, 0],
+    0x12: [0x5D, 0xC0, 0x9C, 0x40, 0, 0, 0, 0],
+    0x13: [0x00, 0x01, 0x8A, 0x88, 0, 0, 0, 0],
+    0x21: [0, 10, 0, 200, 0, 30, 0, 0]
+}
+
+
+def _metric(value, unit, better):
+    return {'value': value, 'unit': unit, 'better': better}
+
+
+def _timings(samples):
+    samples = sorted(samples)
+    return {
+        'mean': statistics.fmean(samples),
+        'p50': samples[len(samples) // 2],
+        'p95': samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    }
+
+
+def bench_decode(frames=20000):
+    # Le thread de réception n'est pas démarré : la boîte de réception est préremplie
+    # et seul le chemin read_sensor_data est mesuré
+    connection = BusConnection(channel=BENCH_CHANNEL, interface='virtual')
+    results = {}
+    try:
+        for arbitration_id, data in SAMPLE_FRAMES.items():
+            reader = CANBusReader(connection=connection, inbox_size=frames)
+            message = can.Message(arbitration_id=arbitration_id, data=data, is_extended_id=False)
+            for _ in range(frames):
+                reader._on_message(message)
+
+            start = time.perf_counter()
+            for _ in range(frames):
+                reader.read_sensor_data(timeout=0)
+            elapsed = time.perf_counter() - start
+            reader.close()
+
+            results[f'decode.0x{arbitration_id:02X}.frames_per_s'] = _metric(frames / elapsed, 'frames/s', 'higher')
+    finally:
+        connection.close()
+    return results
+
+
+def _gui_available():
+    if sys.platform.startswith('linux') and not os.environ.get('DISPLAY'):
+        return False
+    try:
+        import tkinter
+        root = tkinter.Tk()
+        root.destroy()
+        return True
+    except Exception:
+        return False
+
+
+def _pump(app, seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        app.root.update()
+
+
+def _show_tab(app, page):
+    app.notebook.select(page)
+    _pump(app, 0.2)
+
+
+def _time_calls(func, repeat):
+    samples = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        func(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def bench_gui(repeat=200, latency_samples=50):
+    from can_bus_ihm import ModernCANBusHMI
+
+    connection = BusConnection(channel=BENCH_CHANNEL, interface='virtual').start()
+    sender = can.interface.Bus(channel=BENCH_CHANNEL, interface='virtual')
+    app = ModernCANBusHMI(record_dir=None, connection=connection, fps=1000)
+    results = {}
+    try:
+        app.root.geometry("1400x900")
+        app._start_data_simulation()
+        _show_tab(app, app.dashboard_page)
+
+        # Latence réception -> libellé : chaque trame porte une valeur lux unique
+        latencies = []
+        for i in range(latency_samples):
+            value = 1000 + i
+            message = can.Message(arbitration_id=0x11, data=[0, 0, value >> 8, value & 0xFF],
+                                  is_extended_id=False)
+            start = time.perf_counter()
+            sender.send(message)
+            deadline = start + 2.0
+            while app.lux_value.cget('text') != f"{value:.1f}" and time.perf_counter() < deadline:
+                app.root.update()
+            latencies.append((time.perf_counter() - start) * 1000)
+        for name, value in _timings(latencies).items():
+            results[f'gui.receive_to_label.{name}_ms'] = _metric(value, 'ms', 'lower')
+
+        canvas = app.plot_accel_canvas
+        data = [float(i % 40 - 20) for i in range(1000)]
+
+        def draw_plot(i):
+            app._draw_modern_plot(canvas, data[i % 10:], (-20, 20), '#00D4FF', version=i)
+            app.root.update_idletasks()
+
+        pages = [
+            ('gui.draw_modern_plot', app.dashboard_page, draw_plot),
+            ('gui.draw_modern_cube', app.accel_page, lambda i: (
+                app.accel_page.set_accel(i % 90, (i * 2) % 90, (i * 3) % 90),
+                app.accel_page.update_rotation(),
+                app.root.update_idletasks())),
+            ('gui.update_light', app.light_page, lambda i: (
+                app.light_page.set_lux((i * 37) % 1024),
+                app.light_page.update_light(),
+                app.root.update_idletasks())),
+            ('gui.update_temp', app.temp_page, lambda i: (
+                app.temp_page.set_temp(i % 80 - 20),
+                app.temp_page.set_pressure(i % 100),
+                app.temp_page.update_temp(),
+                app.root.update_idletasks()))
+        ]
+        for name, page, func in pages:
+            _show_tab(app, page)
+            for stat, value in _timings(_time_calls(func, repeat)).items():
+                results[f'{name}.{stat}_ms'] = _metric(value, 'ms', 'lower')
+    finally:
+        app.running = False
+        app.scheduler.stop()
+        app.receiver.stop(timeout=1.0)
+        app.accel_page.transmitter.stop()
+        app.root.destroy()
+        sender.shutdown()
+        connection.close()
+    return results
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, metric in results['metrics'].items():
+        reference = baseline.get('metrics', {}).get(name)
+        if reference is None or not reference['value']:
+            continue
+        change = (metric['value'] - reference['value']) / reference['value']
+        worse = -change if metric['better'] == 'higher' else change
+        status = "REGRESSION" if worse > threshold else "ok"
+        print(f"{status:>10}  {name:<45} {reference['value']:>12.3f} -> {metric['value']:>12.3f} {metric['unit']} ({change:+.1%})")
+        if worse > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CAN Bus HMI benchmark suite (virtual bus)")
+    parser.add_argument('--output', default=f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    parser.add_argument('--baseline', help="previous results to compare against")
+    parser.add_argument('--threshold', type=float, default=0.10, help="allowed relative slowdown (0.10 = 10%%)")
+    parser.add_argument('--frames', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--no-gui', action='store_true', help="skip Tk benchmarks")
+    args = parser.parse_args()
+
+    metrics = bench_decode(args.frames)
+    if args.no_gui:
+        gui = 'skipped'
+    elif _gui_available():
+        metrics.update(bench_gui(args.repeat))
+        gui = 'ran'
+    else:
+        print("No display available, Tk benchmarks skipped (run under xvfb-run to include them)")
+        gui = 'unavailable'
+
+    results = {
+        'meta': {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'python_can': can.__version__,
+            'machine': platform.machine(),
+            'gui': gui
+        },
+        'metrics': metrics
+    }
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+            sys.exit(1)
+    else:
+        for name, metric in metrics.items():
+            print(f"{name:<45} {metric['value']:>12.3f} {metric['unit']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import asyncio
+import functools
+
+import can
+
+from can_reading import CANBusReader
+
+
+class AsyncCANBusReader(CANBusReader):
+    def __init__(self, interface='socketcan', channel='can0', decoders=None, connection=None,
+                 frame_logger=None):
+        super().__init__(interface=interface, channel=channel, decoders=decoders, connection=connection,
+                         frame_logger=frame_logger)
+        self._loop = None
+        self._buffered = None
+
+    def _on_message(self, message):
+        # Appelé depuis le thread de réception de la connexion partagée
+        self._observe(message)
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._buffered.on_message_received, message)
+
+    async def start(self):
+        if self._buffered is not None:
+            return
+
+        self._buffered = can.AsyncBufferedReader()
+        self._loop = asyncio.get_running_loop()
+
+    async def stream(self):
+        await self.start()
+
+        async for message in self._buffered:
+            frame = self.decode_message(message)
+            if frame is not None:
+                self.latest.update_frame(frame)
+                yield frame
+
+    async def send(self, hex_id, data_to_send, timeout=None):
+        msg = can.Message(arbitration_id=hex_id, data=data_to_send, is_extended_id=False)
+        # File d'émission pleine : l'attente se fait dans un thread, sans bloquer le loop,
+        # et s'arrête avec la connexion (ou après timeout)
+        loop = asyncio.get_running_loop()
+        sent = await loop.run_in_executor(None, functools.partial(self.connection.send, msg, timeout))
+        if not sent:
+            print("CAN transmit queue is full, message dropped")
+        return sent
+
+    def stop(self):
+        if self._buffered is not None:
+            self._buffered.stop()
+        self._loop = None
+        self.close()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+if __name__ == "__main__":
+
+    async def main():
+        async with AsyncCANBusReader() as reader:
+            async for frame in reader.stream():
+                print(dict(zip(frame.signals, frame.values)))
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("User Interruption")
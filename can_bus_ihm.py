@@ -1,20 +1,44 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+import threading
 import time
-from collections import deque
 from datetime import datetime
 
-import can
-
 from temperature_page import TemperaturePage
 from acceleration_page import AccelerationPage
 from light_page import LightPage
 from can_reading import CANBusReader
+from can_connection import close_all
+from can_receiver import CANReceiveThread
+from plot_widget import RetainedPlot
+from diagnostics_page import DiagnosticsPage
+from frame_logger import RawFrameLogger
+from latency_trace import LatencyTracer
+from recorder import StreamingRecorder, recording_to_csv
+from render_scheduler import RenderScheduler
+from time_series import TimeSeriesStore
 
 class ModernCANBusHMI:
-    def __init__(self):
+    def __init__(self, fps=30, history_capacity=250000, plot_window=3600.0, record_dir='recordings',
+                 capture_file=None, connection=None, acquisition=None, decoders=None):
 
-        self.reader = CANBusReader()
+        self.tracer = LatencyTracer()
+        self.acquisition = acquisition
+        if acquisition is not None:
+            # Acquisition dans un autre processus : décodage, enregistrement et capture y tournent,
+            # l'IHM ne lit que l'anneau en mémoire partagée
+            self.frame_logger = None
+            self.reader = acquisition
+            self.recorder = None
+            self.receiver = None
+        else:
+            self.frame_logger = RawFrameLogger(capture_file) if capture_file is not None else None
+            self.reader = CANBusReader(decoders=decoders, frame_logger=self.frame_logger, connection=connection,
+                                       tracer=self.tracer)
+            # Enregistrement continu depuis le thread de réception, hors du thread Tk
+            self.recorder = StreamingRecorder(record_dir) if record_dir is not None else None
+            sinks = [self.recorder.record] if self.recorder is not None else []
+            self.receiver = CANReceiveThread(self.reader, sinks=sinks)
 
         self.root = tk.Tk()
         self.root.title("CAN Bus Dashboard")
@@ -25,11 +49,8 @@ class ModernCANBusHMI:
         self.style.theme_use('clam')
         self.configure_styles()
         
-        self.max_data_points = 100
-        self.lux_data = deque(maxlen=self.max_data_points)
-        self.accel_data = deque(maxlen=self.max_data_points)
-        self.temp_data = deque(maxlen=self.max_data_points)
-        self.time_data = deque(maxlen=self.max_data_points)
+        self.plot_window = plot_window
+        self.history = TimeSeriesStore(capacity=history_capacity)
         
         self.current_values = {
             'lux': 0,
@@ -41,12 +62,12 @@ class ModernCANBusHMI:
             'theta': 0,
             'psi': 0
         }
-
-        try:
-            self.bus = can.interface.Bus('can0', bustype='socketcan')
-        except Exception as e:
-            print(f"CAN init error: {e}")
-            self.bus = None
+        self.last_sequence = 0
+        self.plot_renderers = {}
+        self.dashboard_dirty = True
+        self.fps = fps
+        # Horodatage noyau de la dernière trame reçue par signal, pas encore affichée
+        self.trace_pending = {}
 
         self.display_mode = "lux"
         
@@ -100,18 +121,33 @@ class ModernCANBusHMI:
 
         self.connection_status.pack(side='right', padx=10)
 
+        self.frame_time_label = tk.Label(header_frame, text="", bg='#0a0a0a', fg='#888888',
+                                         font=('Arial', 10))
+        self.frame_time_label.pack(side='right', padx=10)
+
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill='both', expand=True, padx=20, pady=10)
         
         self.dashboard_page = self._create_dashboard()
-        self.accel_page = AccelerationPage(self.notebook)
+        self.accel_page = AccelerationPage(self.notebook, reader=self.reader)
         self.light_page = LightPage(self.notebook)
         self.temp_page = TemperaturePage(self.notebook)
+        self.diagnostics_page = DiagnosticsPage(self.notebook, self.tracer, health=self.health)
         
         self.notebook.add(self.dashboard_page, text="📊 DASHBOARD")
         self.notebook.add(self.accel_page, text="🌀 ANEMO")
         self.notebook.add(self.light_page, text="💡 LIGHT")
         self.notebook.add(self.temp_page, text="🌡️ TEMPERATURE")
+        self.notebook.add(self.diagnostics_page, text="🩺 DIAGNOSTICS")
+
+        # Une seule boucle de rendu : seul l'onglet visible et modifié est redessiné
+        self.scheduler = RenderScheduler(self.root, self.notebook, fps=self.fps,
+                                         on_stats=self._show_frame_stats)
+        self.scheduler.register(self.dashboard_page, self._update_gui, lambda: self.dashboard_dirty)
+        self.scheduler.register(self.accel_page)
+        self.scheduler.register(self.light_page)
+        self.scheduler.register(self.temp_page)
+        self.scheduler.register(self.diagnostics_page)
         
     def _create_dashboard(self):
         frame = tk.Frame(self.notebook, bg='#0a0a0a') 
@@ -209,7 +245,7 @@ class ModernCANBusHMI:
             self.mode_switch.config(text="🔁 SWITCH TO RANGE")
             self.mode_label.config(text="Current Mode: LUX")
         
-        self._update_plots()
+        self.dashboard_dirty = True
 
     def _create_modern_card(self, parent, title, value_tag, unit, color, column):
         card = tk.Frame(parent, bg='#1a1a1a', relief='flat', bd=0)
@@ -255,6 +291,7 @@ class ModernCANBusHMI:
         
         canvas = tk.Canvas(plot_frame, bg='#151515', highlightthickness=0)
         canvas.pack(fill='both', expand=True, padx=2, pady=2)
+        canvas.bind('<Configure>', self._on_plot_resize)
         
         plot_id = title.lower().split(' ')[0].replace('(', '').replace(')', '')
         setattr(self, f'plot_{plot_id}_canvas', canvas)
@@ -262,82 +299,121 @@ class ModernCANBusHMI:
         
         return canvas
     
+    def _on_plot_resize(self, event):
+        self.dashboard_dirty = True
+
     def _update_plots(self):
-        if len(self.time_data) > 1:
-            if self.display_mode == "lux":
-                data_to_plot = list(self.lux_data)
-                y_range = (0, 1000)
-                color = '#FFD700'
-                title = "💡 Illuminance (Lux)"
-            else:
-                data_to_plot = [self.current_values['range']] * len(self.time_data)
-                y_range = (0, max(data_to_plot) * 1.2 if data_to_plot else 100)
-                color = '#FF6B35'
-                title = "📏 Range (cm)"
-            
-            self.plot_lux_canvas.master.master.winfo_children()[0].winfo_children()[0].config(text=title)
-            
-            self._draw_modern_plot(self.plot_lux_canvas, data_to_plot, y_range, color)
-            self._draw_modern_plot(self.plot_accel_canvas, list(self.accel_data), (-20, 20), '#00D4FF')
-            self._draw_modern_plot(self.plot_temp_canvas, list(self.temp_data), (-10, 60), '#FF4444')
+        if self.display_mode == "lux":
+            data_to_plot, version = self._plot_series('lux')
+            y_range = (0, 1000)
+            color = '#FFD700'
+            title = "💡 Illuminance (Lux)"
+        else:
+            data_to_plot, version = self._plot_series('range')
+            y_range = (0, data_to_plot.max() * 1.2 if len(data_to_plot) and data_to_plot.max() > 0 else 100)
+            color = '#FF6B35'
+            title = "📏 Range (cm)"
+        
+        self.plot_lux_canvas.master.master.winfo_children()[0].winfo_children()[0].config(text=title)
+        
+        self._draw_modern_plot(self.plot_lux_canvas, data_to_plot, y_range, color, version)
+        accel_data, accel_version = self._plot_series('anemo')
+        self._draw_modern_plot(self.plot_accel_canvas, accel_data, (-20, 20), '#00D4FF', accel_version)
+        pressure_data, pressure_version = self._plot_series('pressure')
+        self._draw_modern_plot(self.plot_temp_canvas, pressure_data, (-10, 60), '#FF4444', pressure_version)
+
+    def _plot_series(self, signal):
+        series = self.history.get(signal)
+        last = series.last()
+        if last is None:
+            _, values = series.window()
+        else:
+            _, values = series.since(last[0] - self.plot_window)
+        # Le compteur total identifie le contenu sans comparer les tableaux
+        return values, (signal, series.total, len(values))
     
-    def _draw_modern_plot(self, canvas, data, y_range, color):
-        canvas.delete("all")
-        
-        width = canvas.winfo_width()
-        height = canvas.winfo_height()
-        
-        if width <= 1 or height <= 1:
-            return
-        
-        y_min, y_max = y_range
-        x_scale = width / len(data) if len(data) > 1 else 1
-        y_scale = height / (y_max - y_min)
-        
-        canvas.create_rectangle(0, 0, width, height, fill='#151515', outline='')
-        
-        for i in range(0, height, 40):
-            canvas.create_line(0, i, width, i, fill='#2a2a2a', width=1)
-        
-        points = []
-        for i, value in enumerate(data):
-            x = i * x_scale
-            y = height - (value - y_min) * y_scale
-            points.extend([x, y])
-        
-        if len(points) >= 4:
-            canvas.create_line(points, fill=color, width=3, smooth=True)
-            
-            for i in range(0, len(points)-2, 2):
-                x, y = points[i], points[i+1]
-                canvas.create_oval(x-2, y-2, x+2, y+2, fill=color, outline='')
+    def _draw_modern_plot(self, canvas, data, y_range, color, version=None):
+        plot = self.plot_renderers.get(canvas)
+        if plot is None:
+            plot = RetainedPlot(canvas, y_range, color)
+            self.plot_renderers[canvas] = plot
+        else:
+            plot.set_style(y_range, color)
+        return plot.update(data, version)
     
     def _start_data_simulation(self):
+        if self.acquisition is not None:
+            self.acquisition.start()
+        else:
+            self.reader.connection.start()
+            self.receiver.start()
+
         def generate_data():
-            self.current_values = self.reader.read_can_bus_data()
+            if self.acquisition is not None:
+                frames = self.acquisition.poll(self.history)
+                self.trace_pending.update(frames)
+            else:
+                frames = self.receiver.drain()
 
-            if self.current_values is None:
-                print(f"There is no data being read")
-                return
+                for frame in frames:
+                    self.history.append_frame(frame)
+                    for signal in frame.signals:
+                        self.trace_pending[signal] = frame.timestamp
 
-            if self.current_values['lux'] is not None:
-                self.lux_data.append(self.current_values['lux'])
-            if self.current_values['anemo'] is not None:
-                self.accel_data.append(self.current_values['anemo'])
-            if self.current_values['pressure'] is not None:
-                self.temp_data.append(self.current_values['pressure'])
+            changes, self.last_sequence = self.reader.latest.changed_since(self.last_sequence)
+            for signal, sample in changes.items():
+                self.current_values[signal] = sample.value
 
-            self.last_update = datetime.now().strftime("%H:%M:%S")
-            self.is_connected = True
-            
-            self._update_gui()
+            if frames:
+                self.dashboard_dirty = True
+
+            # État réel de la connexion (bus, rejeu ou processus d'acquisition), plus de CONNECTED implicite
+            connected = self.reader.connected
+            if connected != self.is_connected:
+                self.is_connected = connected
+                self._update_status()
+
+            if changes:
+                self.last_update = datetime.now().strftime("%H:%M:%S")
+                self._dispatch_values()
             
             if self.running:
                 self.root.after(10, generate_data)
         
         generate_data()
+        self.scheduler.start()
+
+    def _show_frame_stats(self, stats):
+        self.frame_time_label.config(text=f"frame {stats['frame_time_ms']:.1f} ms @ {stats['fps_cap']} fps max")
+        self.diagnostics_page.mark_dirty()
+
+    def health(self):
+        if self.acquisition is not None:
+            return {'connected': self.acquisition.connected, 'acquisition': self.acquisition.stats()}
+
+        health = self.reader.health()
+        health['ring_buffer'] = self.receiver.buffer.stats()
+        if self.recorder is not None:
+            health['recorder'] = self.recorder.stats()
+        if self.frame_logger is not None:
+            health['capture'] = self.frame_logger.stats()
+        return health
+
+    def _update_status(self):
+        if self.is_connected:
+            self.connection_status.config(text="● CONNECTED", fg='#00ff88')
+        else:
+            self.connection_status.config(text="● DISCONNECTED", fg='#ff4444')
+
+    def _dispatch_values(self):
+        self.accel_page.set_accel(self.current_values['alpha'], self.current_values['theta'], self.current_values['psi'])
+        self.light_page.set_lux(self.current_values['lux'])
+        self.temp_page.set_temp(self.current_values['temperature'])
+        self.temp_page.set_pressure(self.current_values['pressure'])
     
     def _update_gui(self):
+        self.dashboard_dirty = False
+
         if hasattr(self, 'lux_value'):
             self.lux_value.config(text=f"{self.current_values['lux']:.1f}")
         if hasattr(self, 'range_value'):
@@ -354,34 +430,60 @@ class ModernCANBusHMI:
             self.theta_value.config(text=f"{self.current_values['theta']:.2f}")
         if hasattr(self, 'psi_value'):
             self.psi_value.config(text=f"{self.current_values['psi']:.2f}")
-        
-        if self.is_connected:
-            self.connection_status.config(text="● CONNECTED", fg='#00ff88')
-        else:
-            self.connection_status.config(text="● DISCONNECTED", fg='#ff4444')
+
+        pending, self.trace_pending = self.trace_pending, {}
+        self.tracer.mark_signals(pending, 'gui')
         
         self._update_plots()
-        
-        self.accel_page.set_accel(self.current_values['alpha'], self.current_values['theta'], self.current_values['psi'])
-        self.light_page.set_lux(self.current_values['lux'])
-        self.temp_page.set_temp(self.current_values['temperature'])
-        self.temp_page.set_pressure(self.current_values['pressure'])
+        self.tracer.mark_signals({signal: timestamp for signal, timestamp in pending.items()
+                                  if signal in ('lux', 'range', 'anemo', 'pressure')}, 'render')
     
     def _reset_data(self):
-        self.lux_data.clear()
-        self.accel_data.clear()
-        self.temp_data.clear()
-        self.time_data.clear()
+        self.history.clear()
+        self.dashboard_dirty = True
         messagebox.showinfo("Reset", "All data has been reset successfully!")
     
     def _export_data(self):
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"can_bus_data_{timestamp}.csv"
+
+        if self.recorder is None:
+            self._export_history(filename)
+            return
+
+        # Conversion des enregistrements en CSV dans un thread, le résultat est relevé par after()
+        result = {}
+
+        def convert():
+            try:
+                self.recorder.rotate()
+                result['count'] = recording_to_csv(self.recorder.files, filename)
+            except Exception as e:
+                result['error'] = e
+
+        worker = threading.Thread(target=convert, name="csv-export", daemon=True)
+        worker.start()
+
+        def check():
+            if worker.is_alive():
+                self.root.after(100, check)
+            elif 'error' in result:
+                messagebox.showerror("Export Error", f"Failed to export data:\n{str(result['error'])}")
+            else:
+                messagebox.showinfo("Export Successful", f"{result['count']} samples exported to:\n{filename}")
+
+        check()
+
+    def _export_history(self, filename):
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"can_bus_data_{timestamp}.csv"
+            rows = []
+            for signal in self.history.signals():
+                timestamps, values = self.history.window(signal)
+                rows.extend(zip(timestamps.tolist(), [signal] * len(values), values.tolist()))
+            rows.sort()
             with open(filename, 'w') as f:
-                f.write("Time,Lux,Acceleration,Temperature\n")
-                for i in range(len(self.time_data)):
-                    f.write(f"{self.time_data[i]:.2f},{self.lux_data[i]:.2f},{self.accel_data[i]:.2f},{self.temp_data[i]:.2f}\n")
+                f.write("Time,Signal,Value\n")
+                f.writelines(f"{t:.6f},{signal},{value:.3f}\n" for t, signal, value in rows)
             messagebox.showinfo("Export Successful", f"Data exported to:\n{filename}")
         except Exception as e:
             messagebox.showerror("Export Error", f"Failed to export data:\n{str(e)}")
@@ -393,6 +495,19 @@ class ModernCANBusHMI:
         
         def on_closing():
             self.running = False
+            self.scheduler.stop()
+            if self.receiver is not None:
+                self.receiver.stop(timeout=1.0)
+            if self.recorder is not None:
+                self.recorder.close()
+            if self.frame_logger is not None:
+                self.frame_logger.stop()
+            self.accel_page.transmitter.stop()
+            if self.acquisition is not None:
+                self.acquisition.stop()
+            else:
+                self.reader.connection.close()
+            close_all()
             self.root.destroy()
         
         self.root.protocol("WM_DELETE_WINDOW", on_closing)
@@ -400,8 +515,7 @@ class ModernCANBusHMI:
         self.root.mainloop()
 
 if __name__ == '__main__':
-    try:
-        app = ModernCANBusHMI()
-        app.run()
-    except KeyboardInterrupt:
-        print(f"User Interruption")
\ No newline at end of file
+    import sys
+    from can_cli import main
+
+    main(['--gui', *sys.argv[1:]])
@@ -0,0 +1,166 @@
+import argparse
+import json
+import time
+
+from can_pool import CANReaderPool
+from latency_trace import LatencyTracer
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="CAN bus acquisition (headless by default)")
+    parser.add_argument('--gui', action='store_true', help="start the Tk dashboard")
+    parser.add_argument('--channel', action='append', dest='channels',
+                        help="CAN channel, repeat for several buses (default can0)")
+    parser.add_argument('--interface', default='socketcan')
+    parser.add_argument('--replay', help="read frames from a candump/ASC/BLF log instead of the bus")
+    parser.add_argument('--speed', type=float, default=1.0, help="replay speed factor, 0 for as fast as possible")
+    parser.add_argument('--loop', action='store_true', help="restart the replay at the end of the log")
+    parser.add_argument('--record-dir', default='recordings', help="decoded sample recordings directory")
+    parser.add_argument('--no-record', action='store_true', help="disable the decoded sample recorder")
+    parser.add_argument('--capture', help="raw capture of all bus traffic, not only decoded IDs "
+                                          "(.asc, .blf or .log); disables kernel filtering")
+    parser.add_argument('--stats-interval', type=float, default=5.0, help="seconds between status lines")
+    parser.add_argument('--duration', type=float, help="stop after this many seconds")
+    parser.add_argument('--json', action='store_true', help="print status lines as JSON")
+    parser.add_argument('--signals', help="signal definitions (.dbc or .json) instead of the built-in layout")
+    parser.add_argument('--process', action='store_true',
+                        help="with --gui, acquire in a separate process through shared memory")
+    return parser
+
+
+def open_connection(args, channel):
+    if args.replay:
+        from replay import ReplayConnection
+        return ReplayConnection(args.replay, speed=args.speed, loop=args.loop)
+
+    from can_connection import get_connection
+    return get_connection(channel, args.interface)
+
+
+def open_connections(args):
+    if args.replay:
+        connection = open_connection(args, None)
+        return {connection.channel: connection}
+    return {channel: open_connection(args, channel) for channel in args.channels or ['can0']}
+
+
+def load_signals(args):
+    if args.signals is None:
+        return None
+    from signal_definitions import load_decoders
+    return load_decoders(args.signals)
+
+
+def run_headless(args):
+    frame_logger = None
+    if args.capture:
+        from frame_logger import RawFrameLogger
+        frame_logger = RawFrameLogger(args.capture)
+
+    recorder = None
+    if not args.no_record:
+        from recorder import StreamingRecorder
+        recorder = StreamingRecorder(args.record_dir)
+
+    connections = open_connections(args)
+    # Un rejeu sans --loop se termine avec le log
+    replays = [connection for connection in connections.values() if hasattr(connection, 'finished')]
+    tracer = LatencyTracer()
+    pool = CANReaderPool(connections=connections, decoders=load_signals(args), frame_logger=frame_logger,
+                         tracer=tracer, sinks=[recorder.record] if recorder is not None else [])
+    pool.start()
+
+    started = time.monotonic()
+    last_stats = started
+    last_frames = 0
+    try:
+        while args.duration is None or time.monotonic() - started < args.duration:
+            time.sleep(0.1)
+            # Sans interface, le flux fusionné est simplement vidé : les consommateurs sont les sinks
+            pool.drain()
+            if replays and all(replay.finished.is_set() for replay in replays) and pool.idle:
+                pool.flush()
+                print("Replay finished")
+                break
+
+            now = time.monotonic()
+            if now - last_stats >= args.stats_interval:
+                stats = pool.stats()
+                frames = stats['frames_received']
+                status = {
+                    'uptime_s': round(now - started, 1),
+                    'frames_per_s': round((frames - last_frames) / (now - last_stats), 1),
+                    'overflows': stats['overflows'],
+                    'rx_dropped': stats['rx_dropped'],
+                    'channels': stats['channels'],
+                    'latest': {channel: pool.latest(channel).snapshot() for channel in pool.channels}
+                }
+                if recorder is not None:
+                    status['recorder'] = recorder.stats()
+                if frame_logger is not None:
+                    status['capture'] = frame_logger.stats()
+                print(json.dumps(status, default=str) if args.json else _format_status(status))
+                last_stats, last_frames = now, frames
+    except KeyboardInterrupt:
+        print("User Interruption")
+    finally:
+        pool.stop()
+        if recorder is not None:
+            recorder.close()
+        if frame_logger is not None:
+            frame_logger.stop()
+        for connection in connections.values():
+            connection.close()
+
+
+def _format_load(stats):
+    accepted = stats['traffic']['accepted_load_pct']
+    if stats['interface'] is None:
+        # Bus virtuel ou rejeu : seul le trafic accepté par les filtres est visible
+        return f"accepted {accepted:.1f}%"
+    return f"{stats['interface']['bus_load_pct']:.1f}% (accepted {accepted:.1f}%)"
+
+
+def _format_status(status):
+    prefix = len(status['latest']) > 1
+    values = ' '.join(f"{channel + ':' if prefix else ''}{signal}={value:.2f}"
+                      for channel, latest in status['latest'].items()
+                      for signal, value in latest.items())
+    load = ' '.join(f"{channel}={_format_load(stats)}" for channel, stats in status['channels'].items())
+    return (f"[{status['uptime_s']:>8.1f}s] {status['frames_per_s']:>8.1f} frames/s load {load} "
+            f"overflows={status['overflows']} dropped={status['rx_dropped']} | {values}")
+
+
+def run_gui(args):
+    # Tkinter et les pages ne sont importés que lorsqu'un affichage est demandé
+    from can_bus_ihm import ModernCANBusHMI
+
+    record_dir = None if args.no_record else args.record_dir
+    if args.process:
+        from shared_acquisition import ProcessAcquisition
+        acquisition = ProcessAcquisition(channel=(args.channels or ['can0'])[0], interface=args.interface,
+                                         replay=args.replay, speed=args.speed, loop=args.loop,
+                                         record_dir=record_dir, capture_file=args.capture,
+                                         signals_file=args.signals)
+        app = ModernCANBusHMI(acquisition=acquisition)
+    else:
+        # Le tableau de bord n'affiche qu'un bus : seul le premier canal demandé est ouvert
+        connection = open_connection(args, (args.channels or ['can0'])[0])
+        app = ModernCANBusHMI(record_dir=record_dir, capture_file=args.capture, connection=connection,
+                              decoders=load_signals(args))
+    app.run()
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.gui:
+        try:
+            run_gui(args)
+        except KeyboardInterrupt:
+            print("User Interruption")
+    else:
+        run_headless(args)
+
+
+if __name__ == "__main__":
+    main()
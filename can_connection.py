@@ -0,0 +1,233 @@
+import queue
+import threading
+import time
+
+import can
+
+
+def matches_filters(message, filters):
+    if filters is None:
+        return True
+    for f in filters:
+        mask = f.get('can_mask', 0x1FFFFFFF)
+        if (message.arbitration_id & mask) != (f['can_id'] & mask):
+            continue
+        if 'extended' in f and f['extended'] != message.is_extended_id:
+            continue
+        return True
+    return False
+
+
+def deliver(message, subscribers, owner_filters):
+    # Le noyau applique l'union des filtres : avec plusieurs propriétaires, chacun ne reçoit que les siens
+    shared = len(owner_filters) > 1
+    for callback, owner in subscribers:
+        if shared and not matches_filters(message, owner_filters.get(owner)):
+            continue
+        try:
+            callback(message)
+        except Exception as e:
+            print(f"CAN subscriber error: {e}")
+
+
+class BusConnection:
+    def __init__(self, channel='can0', interface='socketcan', recv_timeout=0.2,
+                 tx_queue_size=256, backoff=0.5, max_backoff=30.0):
+        self.channel = channel
+        self.interface = interface
+        self.recv_timeout = recv_timeout
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self.bus = None
+        self.connected = False
+        self.lossless = False
+        self.reconnects = 0
+        self.rx_errors = 0
+        self.tx_sent = 0
+        self.tx_errors = 0
+        self.tx_dropped = 0
+
+        self._subscribers = []
+        self._filters = {}
+        self._owner_filters = {}
+        self._lock = threading.Lock()
+        self._tx_queue = queue.Queue(maxsize=tx_queue_size)
+        self._stop_event = threading.Event()
+        self._reconnect_needed = threading.Event()
+        self._rx_thread = threading.Thread(target=self._rx_loop, name=f"can-rx-{channel}", daemon=True)
+        self._tx_thread = threading.Thread(target=self._tx_loop, name=f"can-tx-{channel}", daemon=True)
+
+        self._open()
+
+    def start(self):
+        if not self._rx_thread.is_alive():
+            self._rx_thread.start()
+            self._tx_thread.start()
+        return self
+
+    def _open(self):
+        try:
+            bus = can.interface.Bus(channel=self.channel, interface=self.interface)
+        except Exception as e:
+            print(f"Failed to connect to CAN Bus {self.channel}: {e}")
+            self.connected = False
+            return False
+
+        with self._lock:
+            self.bus = bus
+            self.connected = True
+            self._reconnect_needed.clear()
+        self._install_filters()
+        return True
+
+    def _close_bus(self):
+        with self._lock:
+            bus, self.bus = self.bus, None
+            self.connected = False
+        if bus is not None:
+            try:
+                bus.shutdown()
+            except Exception as e:
+                print(f"Error closing CAN Bus {self.channel}: {e}")
+
+    def _reconnect(self):
+        self._close_bus()
+        delay = self.backoff
+        while not self._stop_event.is_set():
+            print(f"Reconnecting to CAN Bus {self.channel} in {delay:.1f}s")
+            if self._stop_event.wait(delay):
+                return
+            if self._open():
+                self.reconnects += 1
+                return
+            delay = min(delay * 2, self.max_backoff)
+
+    def _rx_loop(self):
+        while not self._stop_event.is_set():
+            if not self.connected or self._reconnect_needed.is_set():
+                self._reconnect()
+                continue
+
+            try:
+                message = self.bus.recv(timeout=self.recv_timeout)
+            except Exception as e:
+                print(f"Error reading CAN message: {e}")
+                self.rx_errors += 1
+                self._reconnect_needed.set()
+                continue
+
+            if message is None:
+                continue
+
+            deliver(message, self._subscribers, self._owner_filters)
+
+    def _tx_loop(self):
+        while not self._stop_event.is_set():
+            try:
+                message = self._tx_queue.get(timeout=self.recv_timeout)
+            except queue.Empty:
+                continue
+
+            # Les trames restent en file pendant une reconnexion
+            while not self.connected and not self._stop_event.is_set():
+                self._stop_event.wait(self.recv_timeout)
+
+            try:
+                self.bus.send(message)
+                self.tx_sent += 1
+            except Exception as e:
+                print(f"Error sending CAN message: {e}")
+                self.tx_errors += 1
+                self._reconnect_needed.set()
+
+    def subscribe(self, callback, owner=None, filters=None):
+        with self._lock:
+            self._subscribers = self._subscribers + [(callback, owner)]
+        if owner is not None:
+            self.set_filters(owner, filters)
+
+    def unsubscribe(self, callback, owner=None):
+        with self._lock:
+            self._subscribers = [s for s in self._subscribers if s != (callback, owner)]
+            self._filters.pop(owner, None)
+            self._owner_filters = dict(self._filters)
+        self._install_filters()
+
+    def set_filters(self, owner, filters):
+        with self._lock:
+            self._filters[owner] = filters
+            self._owner_filters = dict(self._filters)
+        self._install_filters()
+
+    def _install_filters(self):
+        # Union des filtres des abonnés ; un abonné sans filtre reçoit tout le trafic
+        with self._lock:
+            bus = self.bus
+            if any(filters is None for filters in self._filters.values()):
+                combined = None
+            else:
+                combined = [f for filters in self._filters.values() for f in filters]
+        if bus is None:
+            return
+        try:
+            bus.set_filters(combined)
+        except Exception as e:
+            print(f"Failed to install CAN filters: {e}")
+
+    def send(self, message, timeout=0):
+        # timeout : 0 rejette immédiatement si la file est pleine, None attend tant que la connexion vit
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = self.recv_timeout if deadline is None else min(self.recv_timeout,
+                                                                       deadline - time.monotonic())
+            try:
+                self._tx_queue.put(message, timeout=max(remaining, 0))
+                return True
+            except queue.Full:
+                if remaining <= 0 or self._stop_event.is_set():
+                    break
+        # Une seule perte comptée par trame abandonnée, quel que soit le nombre d'essais
+        self.tx_dropped += 1
+        return False
+
+    def stats(self):
+        return {
+            'channel': self.channel,
+            'connected': self.connected,
+            'subscribers': len(self._subscribers),
+            'reconnects': self.reconnects,
+            'rx_errors': self.rx_errors,
+            'tx_sent': self.tx_sent,
+            'tx_errors': self.tx_errors,
+            'tx_dropped': self.tx_dropped,
+            'tx_pending': self._tx_queue.qsize()
+        }
+
+    def close(self, timeout=1.0):
+        self._stop_event.set()
+        for thread in (self._rx_thread, self._tx_thread):
+            if thread.is_alive():
+                thread.join(timeout)
+        self._close_bus()
+
+
+_connections = {}
+_connections_lock = threading.Lock()
+
+
+def get_connection(channel='can0', interface='socketcan'):
+    with _connections_lock:
+        connection = _connections.get((interface, channel))
+        if connection is None:
+            connection = BusConnection(channel=channel, interface=interface).start()
+            _connections[(interface, channel)] = connection
+        return connection
+
+
+def close_all():
+    with _connections_lock:
+        connections = list(_connections.values())
+        _connections.clear()
+    for connection in connections:
+        connection.close()
@@ -0,0 +1,134 @@
+import heapq
+import itertools
+import threading
+import time
+
+from can_connection import get_connection
+from can_reading import CANBusReader
+from can_receiver import CANReceiveThread, SampleRingBuffer
+from traffic_stats import kernel_counters
+
+
+class CANReaderPool:
+    def __init__(self, channels=('can0',), interface='socketcan', connections=None, decoders=None,
+                 inbox_size=4096, buffer_size=4096, reorder_window=0.05, sinks=(), tracer=None,
+                 frame_logger=None):
+        # connections : {canal: connexion} pour fournir des connexions existantes (rejeu, tests)
+        if connections is None:
+            connections = {channel: get_connection(channel, interface) for channel in channels}
+        self.channels = list(connections)
+        self.reorder_window = reorder_window
+        self.tracer = tracer
+
+        # Un lecteur et un thread de réception par bus : un bus saturé ne remplit que ses propres files
+        self.readers = {}
+        self.receivers = {}
+        for channel, connection in connections.items():
+            reader = CANBusReader(decoders=decoders, connection=connection, inbox_size=inbox_size,
+                                  frame_logger=frame_logger, tracer=tracer)
+            receiver = CANReceiveThread(reader, buffer=SampleRingBuffer(buffer_size), sinks=sinks)
+            receiver.name = f"can-receive-{channel}"
+            self.readers[channel] = reader
+            self.receivers[channel] = receiver
+
+        self.merged = 0
+        self.late = 0
+        self._pending = []
+        self._sequence = itertools.count()
+        self._last_seen = {channel: float('-inf') for channel in self.channels}
+        self._released_until = float('-inf')
+        self._lock = threading.Lock()
+
+    @property
+    def connected(self):
+        return any(reader.connected for reader in self.readers.values())
+
+    @property
+    def idle(self):
+        # Plus rien en transit : files des lecteurs, buffers de réception et fenêtre de réordonnancement
+        with self._lock:
+            pending = len(self._pending)
+        return (not pending
+                and not any(reader.pending for reader in self.readers.values())
+                and not any(len(receiver.buffer) for receiver in self.receivers.values()))
+
+    def start(self):
+        for channel, receiver in self.receivers.items():
+            self.readers[channel].connection.start()
+            if not receiver.is_alive():
+                receiver.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        for receiver in self.receivers.values():
+            receiver.stop(timeout)
+        for reader in self.readers.values():
+            reader.close()
+
+    def _watermark(self, now):
+        # Chaque bus livre ses trames dans l'ordre : tout ce qui précède la dernière trame vue
+        # sur chacun des bus peut sortir. Un bus silencieux ne bloque pas plus de reorder_window.
+        return max(min(self._last_seen.values()), now - self.reorder_window)
+
+    def drain(self, max_items=None):
+        now = time.time()
+        with self._lock:
+            for channel, receiver in self.receivers.items():
+                for frame in receiver.drain():
+                    if frame.timestamp < self._released_until:
+                        self.late += 1
+                    if frame.timestamp > self._last_seen[channel]:
+                        self._last_seen[channel] = frame.timestamp
+                    heapq.heappush(self._pending, (frame.timestamp, next(self._sequence), frame))
+
+            watermark = self._watermark(now)
+            frames = []
+            while self._pending and self._pending[0][0] <= watermark:
+                if max_items is not None and len(frames) >= max_items:
+                    break
+                frames.append(heapq.heappop(self._pending)[2])
+
+            if frames:
+                self._released_until = frames[-1].timestamp
+                self.merged += len(frames)
+        return frames
+
+    def flush(self):
+        with self._lock:
+            frames = [heapq.heappop(self._pending)[2] for _ in range(len(self._pending))]
+            if frames:
+                self._released_until = frames[-1].timestamp
+                self.merged += len(frames)
+        return frames
+
+    def send_message(self, channel, hex_id, data):
+        return self.readers[channel].send_message(hex_id, data)
+
+    def latest(self, channel):
+        return self.readers[channel].latest
+
+    def stats(self):
+        channels = {}
+        for channel, reader in self.readers.items():
+            receiver = self.receivers[channel]
+            channels[channel] = {
+                'connection': reader.connection.stats(),
+                'kernel': kernel_counters(channel),
+                'interface': reader.interface_load.sample(),
+                'traffic': reader.traffic.summary(),
+                'frames_received': receiver.frames_received,
+                'errors': receiver.errors,
+                'rx_dropped': reader.rx_dropped,
+                'ring_buffer': receiver.buffer.stats()
+            }
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            'channels': channels,
+            'frames_received': sum(c['frames_received'] for c in channels.values()),
+            'rx_dropped': sum(c['rx_dropped'] for c in channels.values()),
+            'overflows': sum(c['ring_buffer']['overflows'] for c in channels.values()),
+            'merged': self.merged,
+            'pending': pending,
+            'late': self.late
+        }
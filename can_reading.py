@@ -1,119 +1,371 @@
+import queue
 import struct
+from collections import namedtuple
+
 import can
+import numpy as np
+
+from can_connection import get_connection
+from signal_store import LatestValueStore
+from traffic_stats import InterfaceLoad, TrafficStats, kernel_counters
+
+DecodedFrame = namedtuple('DecodedFrame', ['timestamp', 'arbitration_id', 'signals', 'values', 'channel'],
+                          defaults=(None,))
+
+FRAME_DTYPE = np.dtype([
+    ('timestamp', 'f8'),
+    ('arbitration_id', 'u4'),
+    ('dlc', 'u1'),
+    ('data', 'u1', (8,))
+])
+
+_NUMPY_CODES = {'b': 'i1', 'B': 'u1', 'h': 'i2', 'H': 'u2', 'i': 'i4', 'I': 'u4', 'q': 'i8', 'Q': 'u8'}
+
+
+def _numpy_dtype(layout):
+    # Traduit un format struct ('>HH', 'x' = octet ignoré) en dtype NumPy avec le même boutisme
+    order = '>' if layout[0] in '>!' else '<'
+    codes = layout[1:] if layout[0] in '<>!=@' else layout
+    names, formats, offsets = [], [], []
+    position = 0
+    for code in codes:
+        if code == 'x':
+            position += 1
+            continue
+        field = np.dtype(order + _NUMPY_CODES[code])
+        names.append(f'f{len(names)}')
+        formats.append(field)
+        offsets.append(position)
+        position += field.itemsize
+    return np.dtype({'names': names, 'formats': formats, 'offsets': offsets, 'itemsize': position})
+
+
+class FrameDecoder:
+    def __init__(self, layout, signals, scale=None, offset=None, fold=None, extended=False):
+        self.struct = struct.Struct(layout)
+        self.extended = extended
+        self.size = self.struct.size
+        self.signals = tuple(signals)
+        self.scale = tuple(scale) if scale is not None else (1,) * len(self.signals)
+        self.offset = tuple(offset) if offset is not None else (0,) * len(self.signals)
+        self.fold = fold
+        self._raw = (fold is None
+                     and all(s == 1 for s in self.scale)
+                     and all(o == 0 for o in self.offset))
+        self.dtype = _numpy_dtype(layout)
+        self.decode = self._compile()
+
+    def _compile(self):
+        # Fonction de décodage générée pour cette trame : mise à l'échelle déroulée,
+        # aussi rapide qu'un décodage écrit à la main
+        names = [f'v{i}' for i in range(len(self.signals))]
+        constants = {'fold': self.fold}
+        if self._raw:
+            body = "    return signals, unpack_from(data)"
+        else:
+            # Les constantes sont liées dans l'espace de noms : repr() ne se relit pas pour tous les
+            # types (np.float64 issu d'un tableau, par exemple)
+            expressions = []
+            for i, (name, scale, offset) in enumerate(zip(names, self.scale, self.offset)):
+                expression = name
+                if self.fold is not None:
+                    # Les angles au-dessus de fold sont ramenés en soustrayant fold
+                    expression = f"({name} - fold if {name} >= fold else {name})"
+                if scale != 1:
+                    expression = f"{expression} * s{i}"
+                    constants[f's{i}'] = scale
+                if offset != 0:
+                    expression = f"{expression} + o{i}"
+                    constants[f'o{i}'] = offset
+                expressions.append(expression)
+            body = (f"    {', '.join(names)}, = unpack_from(data)\n"
+                    f"    return signals, ({', '.join(expressions)},)")
+        source = (f"def decode(data):\n"
+                  f"    if len(data) < {self.size}:\n"
+                  f"        return None\n"
+                  f"{body}\n")
+        namespace = {'unpack_from': self.struct.unpack_from, 'signals': self.signals, **constants}
+        exec(source, namespace)
+        return namespace['decode']
+
+    def decode_batch(self, data):
+        raw = np.ascontiguousarray(data[:, :self.size]).view(self.dtype).reshape(-1)
+
+        columns = []
+        for i, signal in enumerate(self.signals):
+            values = raw[f'f{i}'].astype(self.dtype[i].newbyteorder('='))
+            if not self._raw:
+                # Même arithmétique que decode() : entiers signés 64 bits, ou flottants dès qu'un
+                # facteur n'est pas entier, pour ne jamais déborder du type brut (uint8 - 40...)
+                integral = all(isinstance(x, (int, np.integer)) for x in (self.scale[i], self.offset[i]))
+                values = values.astype(np.int64 if integral else np.float64)
+            if self.fold is not None:
+                values = np.where(values >= self.fold, values - self.fold, values)
+            if self.scale[i] != 1 or self.offset[i] != 0:
+                values = values * self.scale[i] + self.offset[i]
+            columns.append((signal, None, values))
+        return columns
+
+
+class MultiplexedDecoder:
+    def __init__(self, layout, selectors, extended=False):
+        self.struct = struct.Struct(layout)
+        self.extended = extended
+        self.size = self.struct.size
+        self.selectors = {key: (signal,) for key, signal in selectors.items()}
+        self.signals = tuple(selectors.values())
+        self.dtype = _numpy_dtype(layout)
+
+    def decode(self, data):
+        if len(data) < self.size:
+            return None
+
+        selector, value = self.struct.unpack_from(data)
+        signals = self.selectors.get(selector)
+        if signals is None:
+            return None
+        return signals, (value,)
+
+    def decode_batch(self, data):
+        raw = np.ascontiguousarray(data[:, :self.size]).view(self.dtype).reshape(-1)
+        selector = raw['f0']
+        value = raw['f1'].astype(self.dtype[1].newbyteorder('='))
+
+        columns = []
+        for key, (signal,) in self.selectors.items():
+            index = np.flatnonzero(selector == key)
+            if index.size:
+                columns.append((signal, index, value[index]))
+        return columns
+
+
+DEFAULT_DECODERS = {
+    0x03: FrameDecoder('>B', ['anemo']),
+    0x11: MultiplexedDecoder('>HH', {0: 'lux', 1: 'range'}),
+    0x12: FrameDecoder('>HH', ['temperature', 'humidity'], scale=[0.001, 0.001]),
+    0x13: FrameDecoder('>I', ['pressure'], scale=[0.001]),
+    0x21: FrameDecoder('>HHH', ['alpha', 'theta', 'psi'], fold=128),
+}
+
+
+def frames_to_array(messages):
+    messages = list(messages)
+    frames = np.zeros(len(messages), dtype=FRAME_DTYPE)
+    for i, message in enumerate(messages):
+        dlc = min(len(message.data), 8)
+        frames[i]['timestamp'] = message.timestamp
+        frames[i]['arbitration_id'] = message.arbitration_id
+        frames[i]['dlc'] = dlc
+        frames[i]['data'][:dlc] = message.data[:dlc]
+    return frames
+
+
+def _decode_rows(decoder, data):
+    # Repli pour les décodeurs enregistrés sans version vectorisée
+    rows = {}
+    for i, payload in enumerate(data):
+        decoded = decoder.decode(payload.tobytes())
+        if decoded is None:
+            continue
+        for signal, value in zip(*decoded):
+            rows.setdefault(signal, ([], []))
+            rows[signal][0].append(i)
+            rows[signal][1].append(value)
+    return [(signal, np.array(index), np.array(values)) for signal, (index, values) in rows.items()]
+
+
+def decode_batch(frames, decoders=None):
+    if decoders is None:
+        decoders = DEFAULT_DECODERS
+
+    frames = np.asarray(frames, dtype=FRAME_DTYPE)
+    # Colonnes contiguës extraites une seule fois, les masques par ID restent ainsi rapides
+    ids = np.ascontiguousarray(frames['arbitration_id'])
+    dlc = np.ascontiguousarray(frames['dlc'])
+    all_timestamps = np.ascontiguousarray(frames['timestamp'])
+    all_data = np.ascontiguousarray(frames['data'])
+
+    columns = {}
+    for arbitration_id, decoder in decoders.items():
+        mask = ids == arbitration_id
+        mask &= dlc >= decoder.size
+        rows = np.flatnonzero(mask)
+        if not rows.size:
+            continue
+
+        timestamps = all_timestamps[rows]
+        data = all_data[rows]
+
+        decode = getattr(decoder, 'decode_batch', None)
+        decoded = decode(data) if decode is not None else _decode_rows(decoder, data)
+
+        for signal, index, values in decoded:
+            signal_timestamps = timestamps if index is None else timestamps[index]
+            if signal in columns:
+                # Même signal porté par plusieurs IDs : on fusionne par ordre chronologique
+                previous_timestamps, previous_values = columns[signal]
+                signal_timestamps = np.concatenate([previous_timestamps, signal_timestamps])
+                values = np.concatenate([previous_values, values])
+                order = np.argsort(signal_timestamps, kind='stable')
+                signal_timestamps, values = signal_timestamps[order], values[order]
+            columns[signal] = (signal_timestamps, values)
+
+    return columns
+
 
 class CANBusReader:
-    def __init__(self, interface='socketcan', channel='can0'):
+    def __init__(self, interface='socketcan', channel='can0', decoders=None,
+                 connection=None, inbox_size=4096, frame_logger=None, tracer=None, bitrate=500000):
+        self.decoders = dict(DEFAULT_DECODERS if decoders is None else decoders)
+        self._listeners = []
+        self.latest = LatestValueStore(self.signal_names())
+        self.rx_dropped = 0
+        self.frame_logger = frame_logger
+        self.tracer = tracer
+        self.traffic = TrafficStats(bitrate)
+
+        self.connection = connection if connection is not None else get_connection(channel, interface)
+        self._inbox = queue.Queue(maxsize=inbox_size)
+        self._lossless = getattr(self.connection, 'lossless', False)
+        self._closed = False
+        self.interface_load = InterfaceLoad(self.connection.channel, bitrate)
+        self.connection.subscribe(self._on_message, owner=self, filters=self.build_filters())
+        if frame_logger is not None:
+            # Capture post-mortem de tout le trafic : abonnement sans filtre, en amont des filtres du décodeur
+            self.add_listener(frame_logger, frame_logger.on_message, None)
+
+    @property
+    def connected(self):
+        return self.connection.connected
+
+    @property
+    def pending(self):
+        return self._inbox.qsize()
+
+    def _observe(self, message):
+        # Statistiques communes à tous les lecteurs avant la mise en file
+        decoder = self.decoders.get(message.arbitration_id)
+        self.traffic.record(message, decoder.size if decoder is not None else None)
+
+    def _on_message(self, message):
+        self._observe(message)
+        if self._lossless:
+            # Attente bornée : un lecteur fermé ou une connexion arrêtée ne bloque pas l'émetteur
+            while not self._closed and self.connection.connected:
+                try:
+                    self._inbox.put(message, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+            self.rx_dropped += 1
+            return
         try:
-            self.bus = can.interface.Bus(channel=channel, interface=interface)
-            self.connected = True
-        except Exception as e:
-            print(f"Failed to connect to CAN Bus: {e}")
-            self.connected = False
+            self._inbox.put_nowait(message)
+        except queue.Full:
+            self.rx_dropped += 1
+
+    def build_filters(self):
+        # Un filtre exact par ID décodable : le reste du trafic est rejeté par le noyau
+        filters = []
+        for arbitration_id, decoder in sorted(self.decoders.items()):
+            extended = getattr(decoder, 'extended', False)
+            filters.append({'can_id': arbitration_id, 'can_mask': 0x1FFFFFFF if extended else 0x7FF,
+                            'extended': extended})
+        return filters
 
+    def apply_filters(self):
+        self.connection.set_filters(self, self.build_filters())
+
+    def add_listener(self, owner, callback, filters):
+        # Trafic propre à une page : abonnement séparé sur la connexion, hors de la file du décodeur
+        self.connection.subscribe(callback, owner=owner, filters=filters)
+        self._listeners.append((callback, owner))
+
+    def remove_listener(self, owner, callback):
+        if (callback, owner) in self._listeners:
+            self._listeners.remove((callback, owner))
+            self.connection.unsubscribe(callback, owner=owner)
 
     def send_message(self, hex_id, data_to_send):
-        try:
-            with self.bus as canbus:
-                msg = can.Message(arbitration_id=hex_id, data=data_to_send, is_extended_id=False)
-                print("Sending message:", msg)
-                canbus.send(msg)
-        except:
-            print("CAN bus is not configured properly")
-            return
+        msg = can.Message(arbitration_id=hex_id, data=data_to_send, is_extended_id=False)
+        if not self.connection.send(msg):
+            print("CAN transmit queue is full, message dropped")
+            return False
+        return True
 
+    def close(self):
+        self._closed = True
+        self.connection.unsubscribe(self._on_message, owner=self)
+        for callback, owner in self._listeners:
+            self.connection.unsubscribe(callback, owner=owner)
+        self._listeners = []
 
-    def read_sensor_data(self):
-        if not self.connected:
+    def health(self):
+        # rx_dropped : débordements de notre file ; kernel : pertes côté pilote SocketCAN ;
+        # interface : charge totale du bus, traffic : seulement les IDs acceptés par nos filtres
+        return {
+            'connected': self.connected,
+            'rx_dropped': self.rx_dropped,
+            'connection': self.connection.stats(),
+            'kernel': kernel_counters(self.connection.channel),
+            'interface': self.interface_load.sample(),
+            'traffic': self.traffic.summary()
+        }
+
+    def signal_names(self):
+        names = []
+        for decoder in self.decoders.values():
+            names.extend(signal for signal in decoder.signals if signal not in names)
+        return names
+
+    def register_decoder(self, arbitration_id, decoder):
+        self.decoders[arbitration_id] = decoder
+        self.apply_filters()
+
+    def decode_message(self, message):
+        decoder = self.decoders.get(message.arbitration_id)
+        if decoder is None:
             return None
-        
+
+        decoded = decoder.decode(message.data)
+        if decoded is None:
+            return None
+
+        signals, values = decoded
+        return DecodedFrame(message.timestamp, message.arbitration_id, signals, values, self.connection.channel)
+
+    def decode_batch(self, frames):
+        return decode_batch(frames, self.decoders)
+
+    def read_sensor_data(self, timeout=1.0):
+        try:
+            return self._read_frame(timeout)
+        except queue.Empty:
+            return None
+
+    def _read_frame(self, timeout):
+        # queue.Empty sur délai dépassé ; None pour une trame reçue mais non décodable
+        message = self._inbox.get(timeout=timeout)
         try:
-            message = self.bus.recv(timeout=1.0)
-
-            if message is None:
-                return None
-            
-            if message.arbitration_id == 0x11:
-
-                if len(message.data) >= 2:
-                    flag = struct.unpack(">H", message.data[0:2])[0]
-                    value = struct.unpack(">H", message.data[2:4])[0]
-
-                    if flag == 0:
-                        #print("Lux:", value)
-                        return {'type': 'lux', 'value': value}
-                    elif flag == 1:
-                        #print("Range:", value)  
-                        return {'type': 'range', 'value': value}
-                    else:
-                        return {}
-            
-            elif message.arbitration_id == 0X03:
-                anemo = message.data[0]
-                #print("Anemo:", anemo)
-                return {'type': 'anemo', 'value': anemo}
-            
-            elif message.arbitration_id == 0x12:  
-                if len(message.data) > 2:
-                    temp = struct.unpack(">H", message.data[0:2])[0]
-                    humidity = struct.unpack(">H", message.data[2:4])[0]
-                    #print("temperature:", temp/1000, "humidity:", humidity/1000)
-                    return [{'type': 'temperature', 'value': temp/1000}, {'type': 'humidity', 'value': humidity/1000}]
-                
-            elif message.arbitration_id == 0x13:  
-                if len(message.data) > 2:
-                    pression1 = struct.unpack(">H", message.data[0:2])[0]
-                    pression2 = struct.unpack(">H", message.data[2:4])[0]
-                    pression = (pression1*(2**16) + pression2)/1000
-                    #print("pressure:", pression)
-                    return {'type': 'pressure', 'value': pression}
-            
-            elif message.arbitration_id == 0x21:  
-                if len(message.data) > 2:
-                    alpha = struct.unpack(">H", message.data[0:2])[0]
-                    theta = struct.unpack(">H", message.data[2:4])[0]
-                    psi = struct.unpack(">H", message.data[4:6])[0]
-
-                    if alpha > 127:
-                        alpha -= 128 
-                    if theta > 127:
-                        theta -= 128 
-                    if psi > 127:
-                        psi -= 128 
-
-                    #print("Alpha:", alpha, "Theta:", theta, "Psi:", psi)
-                    return [{'type': 'alpha', 'value': alpha},
-                            {'type': 'theta', 'value': theta},
-                            {'type': 'psi', 'value': psi}]
-            
+            frame = self.decode_message(message)
         except Exception as e:
-            print(f"Error reading CAN message: {e}")
+            print(f"Error decoding CAN message: {e}")
             return None
-        
-        return None
-
-    def read_can_bus_data(self):
-        data = {
-            'lux': 0,
-            'range': 0,
-            'anemo': 0,
-            'temperature': 0,
-            'pressure': 0,
-            'alpha': 0,
-            'theta': 0,
-            'psi': 0
-        }
-        
-        for _ in range(10):  
-            sensor_data = self.read_sensor_data()
-            if sensor_data is None:
-                return 
-            
-            if isinstance(sensor_data, list):
-                for obj in sensor_data:
-                    data[obj['type']] = obj['value']
-            else:
-                data[sensor_data['type']] = sensor_data['value']
-        return data
+
+        if frame is not None:
+            self.latest.update_frame(frame)
+            if self.tracer is not None:
+                self.tracer.mark(frame, 'decode')
+        return frame
+
+    def read_can_bus_data(self, max_frames=10, timeout=1.0):
+        # Seul un délai dépassé arrête la lecture : une trame non décodable ne masque pas les suivantes
+        for _ in range(max_frames):
+            try:
+                self._read_frame(timeout)
+            except queue.Empty:
+                break
+        return self.latest.snapshot()
 
 if __name__ == "__main__":
 
@@ -0,0 +1,110 @@
+import threading
+
+
+class SampleRingBuffer:
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self._items = [None] * capacity
+        self._head = 0
+        self._count = 0
+        self._lock = threading.Lock()
+
+        self.pushed = 0
+        self.drained = 0
+        self.overflows = 0
+
+    def __len__(self):
+        return self._count
+
+    def push(self, item):
+        with self._lock:
+            tail = (self._head + self._count) % self.capacity
+            self._items[tail] = item
+            if self._count == self.capacity:
+                # Buffer plein : on écrase l'échantillon le plus ancien
+                self._head = (self._head + 1) % self.capacity
+                self.overflows += 1
+            else:
+                self._count += 1
+            self.pushed += 1
+
+    def drain(self, max_items=None):
+        with self._lock:
+            n = self._count if max_items is None else min(max_items, self._count)
+            items = []
+            for _ in range(n):
+                items.append(self._items[self._head])
+                self._items[self._head] = None
+                self._head = (self._head + 1) % self.capacity
+            self._count -= n
+            self.drained += n
+        return items
+
+    def clear(self):
+        with self._lock:
+            self._items = [None] * self.capacity
+            self._head = 0
+            self._count = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'capacity': self.capacity,
+                'pending': self._count,
+                'pushed': self.pushed,
+                'drained': self.drained,
+                'overflows': self.overflows
+            }
+
+
+class CANReceiveThread(threading.Thread):
+    def __init__(self, reader, buffer=None, recv_timeout=0.1, sinks=()):
+        super().__init__(name="can-receive", daemon=True)
+        self.reader = reader
+        self.buffer = buffer if buffer is not None else SampleRingBuffer()
+        self.sinks = list(sinks)
+        self.recv_timeout = recv_timeout
+        self.frames_received = 0
+        self.errors = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            # Déconnecté : on termine quand même les trames déjà reçues (fin de rejeu)
+            if not self.reader.connected and not self.reader.pending:
+                self._stop_event.wait(self.recv_timeout)
+                continue
+
+            try:
+                frame = self.reader.read_sensor_data(timeout=self.recv_timeout)
+            except Exception as e:
+                print(f"Receive thread error: {e}")
+                self.errors += 1
+                continue
+
+            if frame is None:
+                continue
+
+            self.frames_received += 1
+            try:
+                self.buffer.push(frame)
+                if self.reader.tracer is not None:
+                    self.reader.tracer.mark(frame, 'enqueue')
+            except Exception as e:
+                print(f"Receive thread error: {e}")
+                self.errors += 1
+            # Un sink défaillant (enregistreur, disque plein...) ne doit ni arrêter le thread ni priver les autres
+            for sink in self.sinks:
+                try:
+                    sink(frame)
+                except Exception as e:
+                    print(f"Receive sink error: {e}")
+                    self.errors += 1
+
+    def stop(self, timeout=None):
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def drain(self, max_items=None):
+        return self.buffer.drain(max_items)
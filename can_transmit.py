@@ -0,0 +1,76 @@
+import threading
+import time
+
+
+class TransmitScheduler:
+    def __init__(self, reader, max_rate=20.0):
+        self.reader = reader
+        self.min_interval = 1.0 / max_rate if max_rate else 0.0
+
+        self.submitted = 0
+        self.coalesced = 0
+        self.sent = 0
+        self.failed = 0
+
+        self._pending = {}
+        self._last_sent = {}
+        self._cond = threading.Condition()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="can-tx-scheduler", daemon=True)
+        self._thread.start()
+
+    def submit(self, arbitration_id, data):
+        with self._cond:
+            if arbitration_id in self._pending:
+                # Seule la commande la plus récente part sur le bus
+                self.coalesced += 1
+            self._pending[arbitration_id] = list(data)
+            self.submitted += 1
+            self._cond.notify()
+
+    def _next_ready(self):
+        now = time.monotonic()
+        ready = []
+        wait = None
+        for arbitration_id in list(self._pending):
+            due = self._last_sent.get(arbitration_id, 0.0) + self.min_interval
+            if due <= now:
+                ready.append((arbitration_id, self._pending.pop(arbitration_id)))
+                self._last_sent[arbitration_id] = now
+            elif wait is None or due - now < wait:
+                wait = due - now
+        return ready, wait
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and not self._pending:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                ready, wait = self._next_ready()
+                if not ready:
+                    self._cond.wait(wait)
+                    continue
+
+            for arbitration_id, data in ready:
+                if self.reader.send_message(arbitration_id, data):
+                    self.sent += 1
+                else:
+                    self.failed += 1
+
+    def stats(self):
+        with self._cond:
+            return {
+                'submitted': self.submitted,
+                'coalesced': self.coalesced,
+                'sent': self.sent,
+                'failed': self.failed,
+                'pending': len(self._pending)
+            }
+
+    def stop(self, timeout=1.0):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join(timeout)
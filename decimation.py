@@ -0,0 +1,65 @@
+import numpy as np
+
+
+def minmax_decimate(x, y, buckets):
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = len(y)
+    if buckets <= 0 or n <= 2 * buckets:
+        return x, y
+
+    size = -(-n // buckets)
+    count = -(-n // size)
+    # Dernier seau complété avec sa dernière valeur pour pouvoir tout remodeler en 2D
+    padded = np.empty(count * size, dtype=y.dtype)
+    padded[:n] = y
+    padded[n:] = y[-1]
+    grid = padded.reshape(count, size)
+
+    offsets = np.arange(count) * size
+    low = np.minimum(grid.argmin(axis=1) + offsets, n - 1)
+    high = np.minimum(grid.argmax(axis=1) + offsets, n - 1)
+
+    # Min et max de chaque seau gardés dans l'ordre chronologique
+    index = np.empty(2 * count, dtype=np.intp)
+    index[0::2] = np.minimum(low, high)
+    index[1::2] = np.maximum(low, high)
+    return x[index], y[index]
+
+
+def lttb_decimate(x, y, threshold):
+    x = np.asarray(x, dtype='f8')
+    y = np.asarray(y, dtype='f8')
+    n = len(y)
+    if threshold < 3 or n <= threshold:
+        return x, y
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+    index = np.empty(threshold, dtype=np.intp)
+    index[0] = 0
+    index[-1] = n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = end, edges[i + 2] if i + 2 < len(edges) else n
+        if next_end <= next_start:
+            next_end = next_start + 1
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        # Point du seau qui forme le plus grand triangle avec le point retenu et la moyenne suivante
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a])
+                      - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        index[i + 1] = a
+
+    return x[index], y[index]
+
+
+def decimate(x, y, width, mode='minmax'):
+    if mode == 'minmax':
+        return minmax_decimate(x, y, width // 2)
+    if mode == 'lttb':
+        return lttb_decimate(x, y, width)
+    return np.asarray(x), np.asarray(y)
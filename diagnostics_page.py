@@ -0,0 +1,165 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+from datetime import datetime
+
+from latency_trace import STAGES
+
+
+class DiagnosticsPage(tk.Frame):
+    def __init__(self, parent, tracer, health=None):
+        super().__init__(parent, bg='#0a0a0a')
+        self.tracer = tracer
+        self.health = health
+        self.dirty = True
+        self.create_widgets()
+
+    def create_widgets(self):
+        main_frame = tk.Frame(self, bg='#0a0a0a')
+        main_frame.pack(fill='both', expand=True, padx=20, pady=20)
+
+        if self.health is not None:
+            self._create_traffic_panel(main_frame)
+
+        latency_panel = tk.Frame(main_frame, bg='#1a1a1a', relief='flat', bd=0)
+        latency_panel.pack(fill='both', expand=True, pady=10)
+
+        header = tk.Frame(latency_panel, bg='#9C27B0', height=50)
+        header.pack(fill='x')
+        header_label = tk.Label(header, text="⏱️ PIPELINE LATENCY (ms since kernel timestamp)", bg='#9C27B0',
+                                fg='#000000', font=('Arial', 14, 'bold'))
+        header_label.pack(side='left', padx=15, pady=15)
+
+        export_btn = tk.Button(header, text="📤 EXPORT", command=self._export_latency,
+                               bg='#00d4ff', fg='#000000', font=('Arial', 10, 'bold'),
+                               bd=0, padx=15, pady=6, relief='flat')
+        export_btn.pack(side='right', padx=15)
+
+        reset_btn = tk.Button(header, text="🔄 RESET", command=self._reset_latency,
+                              bg='#00d4ff', fg='#000000', font=('Arial', 10, 'bold'),
+                              bd=0, padx=15, pady=6, relief='flat')
+        reset_btn.pack(side='right')
+
+        style = ttk.Style()
+        style.configure('Diagnostics.Treeview', background='#1a1a1a', fieldbackground='#1a1a1a',
+                        foreground='#e0e0e0', rowheight=24, font=('Arial', 10))
+        style.configure('Diagnostics.Treeview.Heading', background='#2a2a2a', foreground='#ffffff',
+                        font=('Arial', 10, 'bold'))
+
+        columns = ('signal', 'stage', 'count', 'p50', 'p95', 'p99', 'max')
+        self.latency_table = ttk.Treeview(latency_panel, columns=columns, show='headings',
+                                          style='Diagnostics.Treeview')
+        for column in columns:
+            self.latency_table.heading(column, text=column.upper())
+            self.latency_table.column(column, anchor='center', width=110)
+        self.latency_table.pack(fill='both', expand=True, padx=10, pady=10)
+
+    def _create_traffic_panel(self, main_frame):
+        traffic_panel = tk.Frame(main_frame, bg='#1a1a1a', relief='flat', bd=0)
+        traffic_panel.pack(fill='both', expand=True, pady=10)
+
+        header = tk.Frame(traffic_panel, bg='#4CAF50', height=50)
+        header.pack(fill='x')
+        header_label = tk.Label(header, text="📡 BUS TRAFFIC", bg='#4CAF50', fg='#000000',
+                                font=('Arial', 14, 'bold'))
+        header_label.pack(side='left', padx=15, pady=15)
+
+        self.traffic_summary = tk.Label(traffic_panel, text="No traffic", bg='#1a1a1a', fg='#e0e0e0',
+                                        font=('Arial', 11, 'bold'), anchor='w')
+        self.traffic_summary.pack(fill='x', padx=10, pady=(10, 0))
+
+        self.drops_summary = tk.Label(traffic_panel, text="", bg='#1a1a1a', fg='#888888',
+                                      font=('Arial', 10), anchor='w')
+        self.drops_summary.pack(fill='x', padx=10)
+
+        columns = ('id', 'frames_s', 'jitter_ms', 'age_s', 'gaps', 'max_gap_ms', 'length_errors', 'dlc')
+        self.traffic_table = ttk.Treeview(traffic_panel, columns=columns, show='headings', height=6,
+                                          style='Diagnostics.Treeview')
+        for column in columns:
+            self.traffic_table.heading(column, text=column.upper().replace('_', ' '))
+            self.traffic_table.column(column, anchor='center', width=100)
+        self.traffic_table.pack(fill='both', expand=True, padx=10, pady=10)
+
+    def mark_dirty(self):
+        self.dirty = True
+
+    def render(self):
+        self.dirty = False
+        if self.health is not None:
+            self.update_traffic()
+        self.update_latency()
+
+    def update_traffic(self):
+        health = self.health()
+        status = "CONNECTED" if health['connected'] else "DISCONNECTED"
+
+        traffic = health.get('traffic')
+        if traffic is None:
+            # Acquisition dans un autre processus : seuls ses compteurs sont disponibles
+            acquisition = health.get('acquisition', {})
+            self.traffic_summary.config(text=f"{status} | {acquisition.get('frames', 0)} frames "
+                                             f"(separate acquisition process)")
+            self.drops_summary.config(text=f"Drops: inbox {acquisition.get('rx_dropped', 0)}, "
+                                           f"shared ring overruns {acquisition.get('overruns', 0)}")
+            return
+
+        interface = health.get('interface')
+        bus_load = f"bus load {interface['bus_load_pct']:.1f} %" if interface else "bus load n/a"
+        self.traffic_summary.config(
+            text=f"{status} | {bus_load} | accepted-ID load {traffic['accepted_load_pct']:.1f} % | "
+                 f"{traffic['frames_per_s']:.0f} accepted frames/s | gaps {traffic['gaps']} | "
+                 f"length errors {traffic['length_errors']}")
+
+        kernel = health.get('kernel')
+        drops = [f"kernel {kernel.get('rx_dropped', 0) + kernel.get('rx_over_errors', 0)}" if kernel else "kernel n/a",
+                 f"inbox {health['rx_dropped']}",
+                 f"ring {health['ring_buffer']['overflows']}" if 'ring_buffer' in health else None,
+                 f"recorder {health['recorder']['dropped']}" if 'recorder' in health else None,
+                 f"capture {health['capture']['dropped']}" if 'capture' in health else None,
+                 f"rx errors {health['connection'].get('rx_errors', 0)}"]
+        self.drops_summary.config(text="Drops: " + ", ".join(d for d in drops if d is not None))
+
+        existing = set(self.traffic_table.get_children())
+        for arbitration_id, s in traffic['ids'].items():
+            iid = f"0x{arbitration_id:03X}"
+            row = (iid, f"{s['frames_per_s']:.1f}", f"{s['jitter_ms']:.2f}", f"{s['age_s']:.1f}", s['gaps'],
+                   f"{s['max_gap_ms']:.1f}", s['length_errors'], s['dlc'])
+            if iid in existing:
+                self.traffic_table.item(iid, values=row)
+                existing.discard(iid)
+            else:
+                self.traffic_table.insert('', 'end', iid=iid, values=row)
+        for iid in existing:
+            self.traffic_table.delete(iid)
+
+    def update_latency(self):
+        rows = []
+        for signal, stages in sorted(self.tracer.summary().items()):
+            for stage in STAGES:
+                if stage in stages:
+                    s = stages[stage]
+                    rows.append((signal, stage, s['count'], f"{s['p50_ms']:.2f}", f"{s['p95_ms']:.2f}",
+                                 f"{s['p99_ms']:.2f}", f"{s['max_ms']:.2f}"))
+
+        # Les lignes existantes sont mises à jour sur place, clé = signal/étape
+        existing = set(self.latency_table.get_children())
+        for row in rows:
+            iid = f"{row[0]}.{row[1]}"
+            if iid in existing:
+                self.latency_table.item(iid, values=row)
+                existing.discard(iid)
+            else:
+                self.latency_table.insert('', 'end', iid=iid, values=row)
+        for iid in existing:
+            self.latency_table.delete(iid)
+
+    def _reset_latency(self):
+        self.tracer.reset()
+        self.dirty = True
+
+    def _export_latency(self):
+        try:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = self.tracer.export(f"can_bus_latency_{timestamp}.csv")
+            messagebox.showinfo("Export Successful", f"Latency histograms exported to:\n{filename}")
+        except Exception as e:
+            messagebox.showerror("Export Error", f"Failed to export latency:\n{str(e)}")
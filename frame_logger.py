@@ -0,0 +1,94 @@
+import os
+import queue
+import threading
+import time
+
+import can
+
+WRITERS = {
+    '.asc': can.ASCWriter,
+    '.blf': can.BLFWriter,
+    '.log': can.CanutilsLogWriter
+}
+
+
+class RawFrameLogger:
+    def __init__(self, filename, queue_size=65536, stats_interval=1.0):
+        extension = os.path.splitext(filename)[1].lower()
+        if extension not in WRITERS:
+            raise ValueError(f"Unsupported capture format '{extension}', expected one of {sorted(WRITERS)}")
+
+        self.filename = filename
+        self.stats_interval = stats_interval
+        self.writer = WRITERS[extension](filename)
+
+        self.logged = 0
+        self.dropped = 0
+        self.errors = 0
+        self.bytes_written = 0
+        self.throughput = 0.0
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="can-frame-logger", daemon=True)
+        self._thread.start()
+
+    def on_message(self, message):
+        # Appelé sur le chemin de réception : jamais bloquant
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            self.dropped += 1
+
+    def _update_throughput(self, now, last_time, last_bytes):
+        try:
+            self.bytes_written = os.path.getsize(self.filename)
+        except OSError:
+            return last_time, last_bytes
+        elapsed = now - last_time
+        if elapsed > 0:
+            self.throughput = (self.bytes_written - last_bytes) / elapsed
+        return now, self.bytes_written
+
+    def _run(self):
+        last_time, last_bytes = time.monotonic(), 0
+        while self._running or not self._queue.empty():
+            try:
+                message = self._queue.get(timeout=self.stats_interval)
+            except queue.Empty:
+                message = None
+
+            if message is not None:
+                try:
+                    self.writer.on_message_received(message)
+                    self.logged += 1
+                except Exception as e:
+                    print(f"Error writing raw CAN frame: {e}")
+                    self.errors += 1
+
+            now = time.monotonic()
+            if now - last_time >= self.stats_interval:
+                last_time, last_bytes = self._update_throughput(now, last_time, last_bytes)
+
+    def stats(self):
+        return {
+            'file': self.filename,
+            'logged': self.logged,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'pending': self._queue.qsize(),
+            'bytes_written': self.bytes_written,
+            'throughput_bytes_s': self.throughput
+        }
+
+    def stop(self, timeout=5.0):
+        self._running = False
+        self._thread.join(timeout)
+        try:
+            self.writer.stop()
+        except Exception as e:
+            print(f"Error closing capture {self.filename}: {e}")
+        try:
+            self.bytes_written = os.path.getsize(self.filename)
+        except OSError:
+            pass
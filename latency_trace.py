@@ -0,0 +1,112 @@
+import csv
+import json
+import math
+import threading
+import time
+
+STAGES = ('decode', 'enqueue', 'gui', 'render')
+
+
+class LatencyHistogram:
+    def __init__(self, low=1e-6, high=100.0, bins_per_decade=20):
+        self.low = low
+        self.bins_per_decade = bins_per_decade
+        self.bins = int(math.ceil(math.log10(high / low) * bins_per_decade)) + 1
+        self.counts = [0] * self.bins
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, latency):
+        if latency <= self.low:
+            index = 0
+        else:
+            index = min(self.bins - 1, int(math.log10(latency / self.low) * self.bins_per_decade) + 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += latency
+        if latency > self.max:
+            self.max = latency
+
+    def _edge(self, index):
+        return self.low * 10 ** (index / self.bins_per_decade)
+
+    def percentile(self, p):
+        if not self.count:
+            return 0.0
+        target = p / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                # Borne haute du bin, plafonnée par le maximum observé
+                return min(self._edge(index), self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean_ms': self.total / self.count * 1000 if self.count else 0.0,
+            'p50_ms': self.percentile(50) * 1000,
+            'p95_ms': self.percentile(95) * 1000,
+            'p99_ms': self.percentile(99) * 1000,
+            'max_ms': self.max * 1000
+        }
+
+
+class LatencyTracer:
+    def __init__(self, clock=time.time):
+        # message.timestamp est une heure murale (noyau ou python-can) : même horloge ici
+        self.clock = clock
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def record(self, signal, stage, latency):
+        key = (signal, stage)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = LatencyHistogram()
+            histogram.record(latency)
+
+    def mark(self, frame, stage, now=None):
+        if now is None:
+            now = self.clock()
+        latency = now - frame.timestamp
+        for signal in frame.signals:
+            self.record(signal, stage, latency)
+
+    def mark_signals(self, timestamps, stage, now=None):
+        if now is None:
+            now = self.clock()
+        for signal, timestamp in timestamps.items():
+            self.record(signal, stage, now - timestamp)
+
+    def summary(self):
+        with self._lock:
+            items = list(self.histograms.items())
+        result = {}
+        for (signal, stage), histogram in items:
+            result.setdefault(signal, {})[stage] = histogram.summary()
+        return result
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+
+    def export(self, filename):
+        summary = self.summary()
+        if filename.lower().endswith('.csv'):
+            with open(filename, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['signal', 'stage', 'count', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms'])
+                for signal, stages in sorted(summary.items()):
+                    for stage in STAGES:
+                        if stage in stages:
+                            s = stages[stage]
+                            writer.writerow([signal, stage, s['count'], f"{s['mean_ms']:.3f}", f"{s['p50_ms']:.3f}",
+                                             f"{s['p95_ms']:.3f}", f"{s['p99_ms']:.3f}", f"{s['max_ms']:.3f}"])
+        else:
+            with open(filename, 'w') as f:
+                json.dump(summary, f, indent=2)
+        return filename
@@ -1,13 +1,80 @@
 import tkinter as tk
 from tkinter import ttk
+import base64
 import math
+from collections import OrderedDict
+
+import numpy as np
+
+BACKGROUND = (0x0a, 0x0a, 0x0a)
+RING_STEP = 8
+
+
+def render_glow(intensity, max_radius):
+    """Halo de diamètre 2 * max_radius, au format PPM binaire.
+
+    Reproduit les ovales concentriques de l'ancien rendu : chaque pixel prend la
+    couleur du plus petit anneau visible qui le contient.
+    """
+    size = 2 * max_radius
+    radii = np.arange(max_radius, 0, -RING_STEP)[::-1]
+    alphas = (intensity * radii) // max_radius
+    visible = np.flatnonzero(alphas > 0)
+
+    lut = np.empty((len(radii) + 1, 3), dtype=np.uint8)
+    lut[:-1, 0] = 255
+    lut[:-1, 1] = np.minimum(255, 215 + alphas // 2)
+    lut[:-1, 2] = np.minimum(255, alphas // 3)
+    lut[-1] = BACKGROUND
+
+    coords = np.arange(size) - max_radius + 0.5
+    distance = np.hypot(coords[:, None], coords[None, :])
+    ring = np.searchsorted(radii, distance)
+    if len(visible):
+        ring = np.maximum(ring, visible[0])
+    else:
+        ring[:] = len(radii)
+
+    header = f"P6 {size} {size} 255 ".encode()
+    return header + lut[ring].tobytes()
+
+
+class GlowImageCache:
+    def __init__(self, max_images=32):
+        self.max_images = max_images
+        self._images = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, intensity, max_radius):
+        key = (intensity, max_radius)
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+            self.hits += 1
+            return image
+
+        self.misses += 1
+        data = base64.b64encode(render_glow(intensity, max_radius))
+        image = self._images[key] = tk.PhotoImage(data=data, format='PPM')
+        while len(self._images) > self.max_images:
+            self._images.popitem(last=False)
+        return image
+
+    def clear(self):
+        self._images.clear()
+
 
 class LightPage(tk.Frame):
-    def __init__(self, parent):
+    def __init__(self, parent, cache_size=32):
         super().__init__(parent, bg='#0a0a0a')
         self.lux = 0
+        self.dirty = True
+        self.glow_cache = GlowImageCache(cache_size)
+        self._glow_item = None
+        self._outline_item = None
+        self._glow_key = None
         self.create_widgets()
-        self.update_light()
 
     def create_widgets(self):
         main_frame = tk.Frame(self, bg='#0a0a0a')
@@ -70,43 +137,48 @@ class LightPage(tk.Frame):
         self.light_canvas = tk.Canvas(visualization_frame, width=500, height=500, bg='#0a0a0a', 
                                      highlightthickness=2, highlightbackground='#FFD700')
         self.light_canvas.pack(expand=True, pady=20)
+        self.light_canvas.bind('<Configure>', self._on_resize)
+
+    def _on_resize(self, event):
+        self.dirty = True
 
     def set_lux(self, value):
-        self.lux = value
+        if value != self.lux:
+            self.lux = value
+            self.dirty = True
+
+    def render(self):
+        self.dirty = False
+        self.update_light()
 
     def update_light(self):
         intensity = max(0, min(255, int(self.lux / 4)))
         
-        self.light_canvas.delete("all")
-        
         width = self.light_canvas.winfo_width()
         height = self.light_canvas.winfo_height()
         center_x, center_y = width // 2, height // 2
         max_radius = min(width, height) // 2 - 20
-        
-        for radius in range(max_radius, 0, -8):
-            alpha = int(intensity * (radius / max_radius))
-            if alpha > 0:
-                color = self.get_gradient_color(alpha)
-                self.light_canvas.create_oval(
-                    center_x - radius, center_y - radius,
-                    center_x + radius, center_y + radius,
-                    fill=color, outline='', width=0
-                )
-        
-        self.light_canvas.create_oval(
-            center_x - max_radius, center_y - max_radius,
-            center_x + max_radius, center_y + max_radius,
-            outline='#FFD700', width=2
-        )
+
+        # Une seule image par niveau d'intensité et taille : la trame ne fait qu'échanger l'image
+        key = (intensity, max_radius, center_x, center_y)
+        if key != self._glow_key and max_radius > 0:
+            self._glow_key = key
+            image = self.glow_cache.get(intensity, max_radius)
+            outline = (center_x - max_radius, center_y - max_radius,
+                       center_x + max_radius, center_y + max_radius)
+            if self._glow_item is None:
+                self._glow_item = self.light_canvas.create_image(center_x, center_y, image=image)
+                self._outline_item = self.light_canvas.create_oval(*outline, outline='#FFD700', width=2)
+            else:
+                self.light_canvas.itemconfigure(self._glow_item, image=image)
+                self.light_canvas.coords(self._glow_item, center_x, center_y)
+                self.light_canvas.coords(self._outline_item, *outline)
         
         state = "BRIGHT" if self.lux > 500 else "MODERATE" if self.lux > 100 else "DIM"
         state_color = "#00FF00" if self.lux > 500 else "#FFFF00" if self.lux > 100 else "#FF4444"
         
         self.lux_value_label.config(text=f"{self.lux:.1f}")
         self.state_value_label.config(text=state, fg=state_color)
-        
-        self.after(50, self.update_light)
 
     def get_gradient_color(self, alpha):
         r = min(255, 255)
@@ -0,0 +1,133 @@
+import numpy as np
+
+from decimation import decimate
+
+
+class RetainedPlot:
+    def __init__(self, canvas, y_range, color, grid_step=40, background='#151515', grid_color='#2a2a2a',
+                 decimation='minmax', max_markers=100):
+        self.canvas = canvas
+        self.y_range = y_range
+        self.color = color
+        self.decimation = decimation
+        self.max_markers = max_markers
+        self.grid_step = grid_step
+        self.background = background
+        self.grid_color = grid_color
+
+        self.redraws = 0
+        self.skipped = 0
+
+        self._size = None
+        self._data = None
+        self._version = None
+        self._smooth = True
+        self._background = None
+        self._grid = []
+        self._line = None
+        self._markers = []
+        self._visible = 0
+
+    def _create_items(self):
+        self._background = self.canvas.create_rectangle(0, 0, 0, 0, fill=self.background, outline='')
+        self._line = self.canvas.create_line(0, 0, 0, 0, fill=self.color, width=3, smooth=True,
+                                             state='hidden')
+
+    def _layout(self, width, height):
+        self.canvas.coords(self._background, 0, 0, width, height)
+
+        rows = list(range(0, height, self.grid_step))
+        while len(self._grid) < len(rows):
+            self._grid.append(self.canvas.create_line(0, 0, 0, 0, fill=self.grid_color, width=1))
+        while len(self._grid) > len(rows):
+            self.canvas.delete(self._grid.pop())
+        for item, y in zip(self._grid, rows):
+            self.canvas.coords(item, 0, y, width, y)
+
+        # La grille reste sous la courbe et les points
+        self.canvas.tag_raise(self._line)
+        for marker in self._markers:
+            self.canvas.tag_raise(marker)
+
+    def _marker_pool(self, count):
+        while len(self._markers) < count:
+            self._markers.append(self.canvas.create_oval(0, 0, 0, 0, fill=self.color, outline='',
+                                                         state='hidden'))
+
+    def set_style(self, y_range=None, color=None):
+        if y_range is not None and y_range != self.y_range:
+            self.y_range = y_range
+            self._data = None
+            self._version = None
+        if color is not None and color != self.color:
+            self.color = color
+            if self._line is not None:
+                self.canvas.itemconfigure(self._line, fill=color)
+                for marker in self._markers:
+                    self.canvas.itemconfigure(marker, fill=color)
+
+    def update(self, data, version=None):
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        if width <= 1 or height <= 1:
+            return False
+
+        if self._background is None:
+            self._create_items()
+
+        data = np.asarray(data, dtype='f8')
+        size = (width, height)
+        resized = size != self._size
+        if not resized:
+            if version is not None:
+                unchanged = version == self._version
+            else:
+                unchanged = self._data is not None and np.array_equal(data, self._data)
+            if unchanged:
+                self.skipped += 1
+                return False
+
+        if resized:
+            self._layout(width, height)
+            self._size = size
+        self._version = version
+        self._data = data.copy() if version is None else None
+
+        n = len(data)
+        # Nombre de points dessinés borné par la largeur du canvas, quel que soit l'historique
+        index, values = decimate(np.arange(n), data, width, self.decimation)
+
+        y_min, y_max = self.y_range
+        x_scale = width / n if n > 1 else 1
+        y_scale = height / (y_max - y_min)
+
+        xy = np.empty((len(values), 2))
+        xy[:, 0] = index * x_scale
+        xy[:, 1] = height - (values - y_min) * y_scale
+        points = xy.ravel().tolist()
+
+        smooth = len(values) <= self.max_markers
+        if smooth != self._smooth:
+            self.canvas.itemconfigure(self._line, smooth=smooth)
+            self._smooth = smooth
+
+        if len(points) >= 4:
+            self.canvas.coords(self._line, *points)
+            self.canvas.itemconfigure(self._line, state='normal')
+        else:
+            self.canvas.itemconfigure(self._line, state='hidden')
+
+        count = len(points) // 2 - 1 if 4 <= len(points) <= 2 * self.max_markers else 0
+        self._marker_pool(count)
+        for i in range(count):
+            x, y = points[2 * i], points[2 * i + 1]
+            self.canvas.coords(self._markers[i], x - 2, y - 2, x + 2, y + 2)
+        # Seuls les points dont la visibilité change sont reconfigurés
+        for i in range(self._visible, count):
+            self.canvas.itemconfigure(self._markers[i], state='normal')
+        for i in range(count, self._visible):
+            self.canvas.itemconfigure(self._markers[i], state='hidden')
+        self._visible = count
+
+        self.redraws += 1
+        return True
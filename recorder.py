@@ -0,0 +1,204 @@
+import os
+import queue
+import threading
+import time
+import zipfile
+from collections import namedtuple
+from datetime import datetime
+
+import numpy as np
+
+SAMPLE_DTYPE = np.dtype([('timestamp', 'f8'), ('value', 'f8')])
+
+_Command = namedtuple('_Command', ['name', 'done'])
+
+
+class StreamingRecorder:
+    def __init__(self, directory='recordings', prefix='can_record', chunk_size=4096,
+                 flush_interval=1.0, max_file_bytes=64 * 1024 * 1024, max_file_seconds=3600,
+                 queue_size=65536):
+        self.directory = directory
+        self.prefix = prefix
+        self.chunk_size = chunk_size
+        self.flush_interval = flush_interval
+        self.max_file_bytes = max_file_bytes
+        self.max_file_seconds = max_file_seconds
+
+        self.files = []
+        self.recorded = 0
+        self.dropped = 0
+        self.chunks = 0
+        self.errors = 0
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._pending = {}
+        self._pending_count = 0
+        self._chunk_index = 0
+        self._zip = None
+        self._path = None
+        self._opened_at = 0.0
+        self._thread = threading.Thread(target=self._run, name="can-recorder", daemon=True)
+        self._thread.start()
+
+    def record(self, frame):
+        try:
+            self._queue.put_nowait(frame)
+        except queue.Full:
+            self.dropped += 1
+
+    def rotate(self, timeout=5.0):
+        # Ferme le fichier courant pour qu'il soit lisible, puis attend la fin de l'opération
+        done = threading.Event()
+        try:
+            self._queue.put(_Command('rotate', done), timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        # File pleine et écrivain bloqué ou arrêté : on abandonne plutôt que de figer l'appelant
+        done = threading.Event()
+        try:
+            self._queue.put(_Command('close', done), timeout=timeout)
+        except queue.Full:
+            print("Recorder queue is full, pending samples discarded")
+            return
+        done.wait(timeout)
+        self._thread.join(timeout)
+
+    def _run(self):
+        last_flush = time.monotonic()
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, _Command):
+                self._flush()
+                self._close_file()
+                item.done.set()
+                if item.name == 'close':
+                    return
+                continue
+
+            if item is not None:
+                for signal, value in zip(item.signals, item.values):
+                    self._pending.setdefault(signal, []).append((item.timestamp, value))
+                self._pending_count += 1
+
+            now = time.monotonic()
+            if self._pending_count >= self.chunk_size or now - last_flush >= self.flush_interval:
+                self._flush()
+                last_flush = now
+
+    def _open_file(self):
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        self._path = os.path.join(self.directory, f"{self.prefix}_{stamp}.npz")
+        self._zip = zipfile.ZipFile(self._path, 'w', compression=zipfile.ZIP_DEFLATED)
+        self._opened_at = time.monotonic()
+        self._chunk_index = 0
+
+    def _close_file(self):
+        if self._zip is None:
+            return
+        try:
+            self._zip.close()
+            self.files.append(self._path)
+        except Exception as e:
+            print(f"Error closing recording {self._path}: {e}")
+        self._zip = None
+        self._path = None
+
+    def _flush(self):
+        if not self._pending:
+            return
+
+        # Toute erreur disque (dossier absent, lecture seule, disque plein) est comptée :
+        # le thread d'écriture survit et réessaie au chunk suivant
+        try:
+            if self._zip is None:
+                self._open_file()
+            for signal, samples in self._pending.items():
+                chunk = np.array(samples, dtype=SAMPLE_DTYPE)
+                # Un membre .npy par signal et par chunk : le fichier reste un .npz standard
+                with self._zip.open(f"{self._chunk_index:06d}/{signal}.npy", 'w') as member:
+                    np.lib.format.write_array(member, chunk, allow_pickle=False)
+            self._chunk_index += 1
+            self.chunks += 1
+            self.recorded += self._pending_count
+        except Exception as e:
+            print(f"Error writing recording chunk: {e}")
+            self.errors += 1
+            self.dropped += self._pending_count
+        self._pending = {}
+        self._pending_count = 0
+
+        if self._zip is None:
+            return
+        try:
+            size = self._zip.fp.tell() if self._zip.fp is not None else 0
+        except (OSError, ValueError):
+            size = self.max_file_bytes
+        if size >= self.max_file_bytes or time.monotonic() - self._opened_at >= self.max_file_seconds:
+            self._close_file()
+
+    def stats(self):
+        return {
+            'file': self._path,
+            'files': len(self.files),
+            'recorded': self.recorded,
+            'dropped': self.dropped,
+            'chunks': self.chunks,
+            'errors': self.errors,
+            'pending': self._queue.qsize()
+        }
+
+
+def load_recording(paths):
+    if isinstance(paths, str):
+        paths = [paths]
+
+    parts = {}
+    for path in paths:
+        with np.load(path, allow_pickle=False) as archive:
+            for key in sorted(archive.files):
+                signal = key.split('/', 1)[1]
+                parts.setdefault(signal, []).append(archive[key])
+
+    columns = {}
+    for signal, chunks in parts.items():
+        samples = np.concatenate(chunks)
+        columns[signal] = (samples['timestamp'], samples['value'])
+    return columns
+
+
+def recording_to_csv(paths, filename):
+    columns = load_recording(paths)
+    timestamps, names, values = [np.empty(0)], [np.empty(0, dtype=str)], [np.empty(0)]
+    for signal, (signal_timestamps, signal_values) in columns.items():
+        timestamps.append(signal_timestamps)
+        names.append(np.full(len(signal_timestamps), signal))
+        values.append(signal_values)
+
+    timestamps = np.concatenate(timestamps)
+    order = np.argsort(timestamps, kind='stable')
+    rows = zip(timestamps[order].tolist(), np.concatenate(names)[order].tolist(),
+               np.concatenate(values)[order].tolist())
+
+    with open(filename, 'w') as f:
+        f.write("Time,Signal,Value\n")
+        f.writelines(f"{t:.6f},{signal},{value:.3f}\n" for t, signal, value in rows)
+    return len(order)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 3:
+        print("Usage: python recorder.py <recording.npz> [...] <output.csv>")
+        sys.exit(1)
+
+    count = recording_to_csv(sys.argv[1:-1], sys.argv[-1])
+    print(f"{count} samples written to {sys.argv[-1]}")
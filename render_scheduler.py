@@ -0,0 +1,96 @@
+import time
+from collections import deque
+
+
+class RenderScheduler:
+    def __init__(self, root, notebook=None, fps=30, on_stats=None, stats_interval=1.0):
+        self.root = root
+        self.notebook = notebook
+        self.on_stats = on_stats
+        self.stats_interval = stats_interval
+        self.set_fps(fps)
+
+        self.frames = 0
+        self.renders = 0
+        self.skipped = 0
+        self.frame_times = deque(maxlen=120)
+
+        self._entries = []
+        self._running = False
+        self._after_id = None
+        self._last_stats = time.perf_counter()
+
+    def set_fps(self, fps):
+        self.fps = fps
+        self.interval = 1.0 / fps
+
+    def register(self, widget, render=None, is_dirty=None, always=False):
+        # Par défaut une page expose render() et un attribut dirty
+        if render is None:
+            render = widget.render
+        if is_dirty is None:
+            is_dirty = lambda: getattr(widget, 'dirty', True)
+        self._entries.append((widget, render, is_dirty, always))
+
+    def _selected(self):
+        if self.notebook is None:
+            return None
+        return self.notebook.select()
+
+    def _tick(self):
+        self._after_id = None
+        if not self._running:
+            return
+
+        start = time.perf_counter()
+        selected = self._selected()
+        for widget, render, is_dirty, always in self._entries:
+            if not always and selected is not None and str(widget) != selected:
+                self.skipped += 1
+                continue
+            if not is_dirty():
+                self.skipped += 1
+                continue
+            try:
+                render()
+                self.renders += 1
+            except Exception as e:
+                print(f"Render error in {widget}: {e}")
+
+        end = time.perf_counter()
+        self.frame_times.append(end - start)
+        self.frames += 1
+
+        if self.on_stats is not None and end - self._last_stats >= self.stats_interval:
+            self._last_stats = end
+            self.on_stats(self.stats())
+
+        delay = max(1, int((self.interval - (end - start)) * 1000))
+        self._after_id = self.root.after(delay, self._tick)
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._tick()
+
+    def stop(self):
+        self._running = False
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def stats(self):
+        times = list(self.frame_times)
+        average = sum(times) / len(times) if times else 0.0
+        return {
+            'fps_cap': self.fps,
+            'frames': self.frames,
+            'renders': self.renders,
+            'skipped': self.skipped,
+            'frame_time_ms': average * 1000,
+            'max_frame_time_ms': max(times) * 1000 if times else 0.0
+        }
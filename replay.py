@@ -0,0 +1,168 @@
+import threading
+import time
+
+import can
+
+from can_connection import deliver, matches_filters
+
+
+class LogReplayer:
+    def __init__(self, filename, speed=1.0, loop=False):
+        self.filename = filename
+        # speed=None ou 0 : aussi vite que possible
+        self.speed = speed
+        self.loop = loop
+        self.replayed = 0
+        self.passes = 0
+
+    def messages(self, stop_event=None):
+        while True:
+            offset = None
+            start = time.perf_counter()
+            for message in can.LogReader(self.filename):
+                if stop_event is not None and stop_event.is_set():
+                    return
+                if message.is_error_frame or message.is_remote_frame:
+                    continue
+
+                if self.speed:
+                    if offset is None:
+                        offset = message.timestamp
+                    delay = start + (message.timestamp - offset) / self.speed - time.perf_counter()
+                    if delay > 0:
+                        if stop_event is not None:
+                            if stop_event.wait(delay):
+                                return
+                        else:
+                            time.sleep(delay)
+
+                self.replayed += 1
+                yield message
+
+            self.passes += 1
+            if not self.loop:
+                return
+
+    def play(self, sink, stop_event=None):
+        for message in self.messages(stop_event):
+            sink(message)
+        return self.replayed
+
+    def play_to_bus(self, channel='replay', interface='virtual', stop_event=None):
+        bus = can.interface.Bus(channel=channel, interface=interface)
+        try:
+            return self.play(bus.send, stop_event)
+        finally:
+            bus.shutdown()
+
+
+class ReplayConnection:
+    # Remplace BusConnection derrière CANBusReader : même interface, trafic lu depuis un log
+    def __init__(self, filename, speed=1.0, loop=False, channel='replay'):
+        self.channel = channel
+        self.replayer = LogReplayer(filename, speed=speed, loop=loop)
+        # À vitesse maximale, les abonnés sont servis sans perte pour un profilage reproductible
+        self.lossless = not speed
+        self.connected = True
+        self.finished = threading.Event()
+        self.tx_sent = 0
+
+        self._subscribers = []
+        self._filters = {}
+        self._owner_filters = {}
+        self._combined = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"can-replay-{channel}", daemon=True)
+
+    def start(self):
+        if not self._thread.is_alive() and not self.finished.is_set():
+            self._thread.start()
+        return self
+
+    def _run(self):
+        # Les consommateurs (latence, âge, fusion multi-bus) comparent message.timestamp à l'horloge
+        # murale : chaque trame est réhorodatée à sa livraison, écarts relatifs du log conservés
+        origin = previous = None
+        speed = self.replayer.speed
+        for message in self.replayer.messages(self._stop_event):
+            if not matches_filters(message, self._combined):
+                continue
+            if not speed:
+                message.timestamp = time.time()
+            else:
+                if origin is None or message.timestamp < previous:
+                    # Premier passage ou reprise en boucle : nouvelle origine
+                    origin = (message.timestamp, time.time())
+                previous = message.timestamp
+                message.timestamp = origin[1] + (message.timestamp - origin[0]) / speed
+            deliver(message, self._subscribers, self._owner_filters)
+        # Fin du log : plus rien ne sera reçu
+        self.connected = False
+        self.finished.set()
+
+    def subscribe(self, callback, owner=None, filters=None):
+        with self._lock:
+            self._subscribers = self._subscribers + [(callback, owner)]
+        if owner is not None:
+            self.set_filters(owner, filters)
+
+    def unsubscribe(self, callback, owner=None):
+        with self._lock:
+            self._subscribers = [s for s in self._subscribers if s != (callback, owner)]
+            self._filters.pop(owner, None)
+            self._owner_filters = dict(self._filters)
+        self._install_filters()
+
+    def set_filters(self, owner, filters):
+        with self._lock:
+            self._filters[owner] = filters
+            self._owner_filters = dict(self._filters)
+        self._install_filters()
+
+    def _install_filters(self):
+        with self._lock:
+            if any(filters is None for filters in self._filters.values()):
+                self._combined = None
+            else:
+                self._combined = [f for filters in self._filters.values() for f in filters]
+
+    def send(self, message, timeout=0):
+        self.tx_sent += 1
+        return True
+
+    def stats(self):
+        return {
+            'channel': self.channel,
+            'connected': self.connected,
+            'subscribers': len(self._subscribers),
+            'replayed': self.replayer.replayed,
+            'passes': self.replayer.passes,
+            'finished': self.finished.is_set(),
+            'tx_sent': self.tx_sent
+        }
+
+    def close(self, timeout=1.0):
+        self._stop_event.set()
+        self.connected = False
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replay a candump/ASC/BLF log onto a CAN bus")
+    parser.add_argument('log')
+    parser.add_argument('--channel', default='can0')
+    parser.add_argument('--interface', default='socketcan')
+    parser.add_argument('--speed', type=float, default=1.0, help="0 replays as fast as possible")
+    parser.add_argument('--loop', action='store_true')
+    args = parser.parse_args()
+
+    replayer = LogReplayer(args.log, speed=args.speed, loop=args.loop)
+    try:
+        count = replayer.play_to_bus(args.channel, args.interface)
+        print(f"{count} frames replayed")
+    except KeyboardInterrupt:
+        print("User Interruption")
@@ -0,0 +1,233 @@
+import multiprocessing as mp
+import queue
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from can_reading import DEFAULT_DECODERS
+from signal_store import LatestValueStore
+
+# Enregistrement fixe de 24 octets par échantillon décodé
+RECORD_DTYPE = np.dtype([('timestamp', 'f8'), ('value', 'f8'), ('signal', 'u4'), ('channel', 'u4')])
+
+# En-tête : compteurs u8 écrits par le processus d'acquisition uniquement
+HEADER_SLOTS = 8
+CAPACITY, WRITTEN, FRAMES, RX_DROPPED, CONNECTED, ERRORS = range(6)
+HEADER_BYTES = HEADER_SLOTS * 8
+# Enregistrements laissés entre le lecteur et l'écrivain : au moins une trame décodée complète
+WRITE_MARGIN = 64
+
+
+def signal_table(decoders=None):
+    signals = []
+    for decoder in (DEFAULT_DECODERS if decoders is None else decoders).values():
+        signals.extend(signal for signal in decoder.signals if signal not in signals)
+    return signals
+
+
+class SharedSampleRing:
+    def __init__(self, name=None, capacity=1 << 20, create=False):
+        size = HEADER_BYTES + capacity * RECORD_DTYPE.itemsize
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=size if create else 0)
+        self.name = self.shm.name
+        self.header = np.ndarray((HEADER_SLOTS,), dtype='u8', buffer=self.shm.buf)
+        if create:
+            self.header[:] = 0
+            self.header[CAPACITY] = capacity
+        self.capacity = int(self.header[CAPACITY])
+        self.records = np.ndarray((self.capacity,), dtype=RECORD_DTYPE, buffer=self.shm.buf, offset=HEADER_BYTES)
+        self.margin = min(WRITE_MARGIN, self.capacity // 4)
+
+        self._read = 0
+        self.overruns = 0
+
+    def write_frame(self, frame, signal_ids, channel=0):
+        # Un seul écrivain : les enregistrements d'abord, le compteur ensuite
+        written = int(self.header[WRITTEN])
+        for signal, value in zip(frame.signals, frame.values):
+            self.records[written % self.capacity] = (frame.timestamp, value, signal_ids[signal], channel)
+            written += 1
+        self.header[WRITTEN] = written
+
+    @property
+    def written(self):
+        return int(self.header[WRITTEN])
+
+    def read(self):
+        # Copie puis relecture du compteur (façon seqlock) : l'écrivain ne s'arrête jamais, tout
+        # enregistrement qu'il a pu réécrire pendant la copie est écarté. La marge couvre une trame
+        # en cours d'écriture, dont les enregistrements précèdent la mise à jour du compteur.
+        written = self.written
+        start = max(self._read, written - self.capacity + self.margin)
+        if start >= written:
+            self._read = max(self._read, written)
+            return []
+
+        first, last = start % self.capacity, written % self.capacity
+        if first < last:
+            records = self.records[first:last].copy()
+        else:
+            records = np.concatenate([self.records[first:], self.records[:last]])
+
+        safe = self.written - self.capacity + self.margin
+        if safe > start:
+            records = records[safe - start:]
+            start = safe
+        # Le lecteur a pris un tour de retard : les plus anciens sont perdus
+        self.overruns += start - self._read
+        self._read = written
+        return [records] if len(records) else []
+
+    def close(self, unlink=False):
+        # Les vues numpy doivent disparaître avant de fermer le segment
+        del self.header, self.records
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+def _open_connection(channel, interface, replay, speed, loop):
+    if replay:
+        from replay import ReplayConnection
+        return ReplayConnection(replay, speed=speed, loop=loop)
+
+    from can_connection import get_connection
+    return get_connection(channel, interface)
+
+
+def _load_decoders(signals_file):
+    if signals_file is None:
+        return None
+    from signal_definitions import load_decoders
+    return load_decoders(signals_file)
+
+
+def run_acquisition(ring_name, signals, channel, interface, replay, speed, loop, record_dir, capture_file,
+                    signals_file, commands, stop_event):
+    from can_reading import CANBusReader
+
+    ring = SharedSampleRing(ring_name)
+    signal_ids = {signal: index for index, signal in enumerate(signals)}
+
+    frame_logger = None
+    if capture_file is not None:
+        from frame_logger import RawFrameLogger
+        frame_logger = RawFrameLogger(capture_file)
+    recorder = None
+    if record_dir is not None:
+        from recorder import StreamingRecorder
+        recorder = StreamingRecorder(record_dir)
+
+    connection = _open_connection(channel, interface, replay, speed, loop)
+    reader = CANBusReader(decoders=_load_decoders(signals_file), connection=connection, frame_logger=frame_logger)
+    connection.start()
+
+    try:
+        while not stop_event.is_set():
+            try:
+                while True:
+                    reader.send_message(*commands.get_nowait())
+            except queue.Empty:
+                pass
+
+            try:
+                frame = reader.read_sensor_data(timeout=0.1)
+            except Exception as e:
+                print(f"Acquisition process error: {e}")
+                ring.header[ERRORS] += 1
+                continue
+
+            ring.header[CONNECTED] = int(reader.connected)
+            ring.header[RX_DROPPED] = reader.rx_dropped
+            if frame is None:
+                continue
+
+            ring.write_frame(frame, signal_ids)
+            ring.header[FRAMES] += 1
+            if recorder is not None:
+                recorder.record(frame)
+    finally:
+        reader.close()
+        connection.close()
+        if recorder is not None:
+            recorder.close()
+        if frame_logger is not None:
+            frame_logger.stop()
+        ring.close()
+
+
+class ProcessAcquisition:
+    def __init__(self, channel='can0', interface='socketcan', replay=None, speed=1.0, loop=False,
+                 record_dir='recordings', capture_file=None, capacity=1 << 20, signals_file=None):
+        # Les décodeurs ne traversent pas la frontière de processus : chaque côté relit le fichier (cache)
+        self.signals = signal_table(_load_decoders(signals_file))
+        self.latest = LatestValueStore(self.signals)
+        self.ring = SharedSampleRing(capacity=capacity, create=True)
+
+        # spawn : jamais de fork d'un processus qui contient déjà Tk
+        context = mp.get_context('spawn')
+        self._commands = context.Queue(maxsize=256)
+        self._stop_event = context.Event()
+        self.process = context.Process(
+            target=run_acquisition, name="can-acquisition", daemon=True,
+            args=(self.ring.name, self.signals, channel, interface, replay, speed, loop, record_dir,
+                  capture_file, signals_file, self._commands, self._stop_event))
+        self.samples_read = 0
+
+    @property
+    def connected(self):
+        return bool(self.ring.header[CONNECTED])
+
+    @property
+    def rx_dropped(self):
+        return int(self.ring.header[RX_DROPPED])
+
+    def start(self):
+        if not self.process.is_alive():
+            self.process.start()
+        return self
+
+    def poll(self, history=None):
+        # Renvoie l'horodatage du dernier échantillon lu par signal
+        last_seen = {}
+        for view in self.ring.read():
+            self.samples_read += len(view)
+            ids = view['signal']
+            for index in np.unique(ids):
+                signal = self.signals[index]
+                mask = ids == index
+                timestamps, values = view['timestamp'][mask], view['value'][mask]
+                if history is not None:
+                    history.get(signal).extend(timestamps, values)
+                self.latest.update(signal, float(values[-1]), float(timestamps[-1]))
+                last_seen[signal] = float(timestamps[-1])
+        return last_seen
+
+    def send_message(self, hex_id, data_to_send):
+        try:
+            self._commands.put_nowait((hex_id, list(data_to_send)))
+            return True
+        except queue.Full:
+            print("CAN transmit queue is full, message dropped")
+            return False
+
+    def stats(self):
+        header = self.ring.header
+        return {
+            'alive': self.process.is_alive(),
+            'connected': bool(header[CONNECTED]),
+            'frames': int(header[FRAMES]),
+            'samples_written': int(header[WRITTEN]),
+            'samples_read': self.samples_read,
+            'overruns': self.ring.overruns,
+            'rx_dropped': int(header[RX_DROPPED]),
+            'errors': int(header[ERRORS])
+        }
+
+    def stop(self, timeout=2.0):
+        self._stop_event.set()
+        if self.process.is_alive():
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.terminate()
+        self.ring.close(unlink=True)
@@ -0,0 +1,184 @@
+import hashlib
+import json
+import os
+import re
+
+from can_reading import FrameDecoder, MultiplexedDecoder
+
+CACHE_VERSION = 2
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'can_hmi')
+
+_STRUCT_CODES = {
+    (8, False): 'B', (8, True): 'b', (16, False): 'H', (16, True): 'h',
+    (32, False): 'I', (32, True): 'i', (64, False): 'Q', (64, True): 'q'
+}
+
+_MESSAGE = re.compile(r'^BO_\s+(\d+)\s+(\w+)\s*:\s*(\d+)')
+_SIGNAL = re.compile(r'^SG_\s+(\w+)\s*(M|m\d+)?\s*:\s*(\d+)\|(\d+)@([01])([+-])\s*\(([^,]+),([^)]+)\)')
+# Attribut de message propre au banc : valeur au-delà de laquelle on soustrait Fold (angles)
+_FOLD = re.compile(r'^BA_\s+"Fold"\s+BO_\s+(\d+)\s+(\d+)\s*;')
+
+
+def _number(text):
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+
+def _struct_code(message, signal):
+    code = _STRUCT_CODES.get((signal['length'], signal['signed']))
+    start = signal['start']
+    # Motorola (@0) : le bit de départ est le MSB ; Intel (@1) : le LSB
+    aligned = start % 8 == (7 if signal['big_endian'] else 0)
+    if code is None or not aligned:
+        raise ValueError(f"{message}.{signal['name']}: only byte-aligned 8/16/32/64-bit signals are supported")
+    return code, start // 8
+
+
+def _layout(message, signals):
+    if len({signal['big_endian'] for signal in signals}) > 1:
+        raise ValueError(f"{message}: mixed byte orders are not supported")
+
+    layout = '>' if signals[0]['big_endian'] else '<'
+    position = 0
+    for signal in signals:
+        code, byte = _struct_code(message, signal)
+        if byte < position:
+            raise ValueError(f"{message}.{signal['name']}: overlapping signals")
+        layout += 'x' * (byte - position) + code
+        position = byte + signal['length'] // 8
+    return layout
+
+
+def _compile_message(arbitration_id, name, signals, fold):
+    multiplexer = [signal for signal in signals if signal['mux'] == 'M']
+    if not multiplexer:
+        signals = sorted(signals, key=lambda signal: signal['start'] // 8)
+        definition = {
+            'id': arbitration_id,
+            'name': name,
+            'layout': _layout(name, signals),
+            'signals': [signal['name'] for signal in signals],
+            'scale': [signal['factor'] for signal in signals],
+            'offset': [signal['offset'] for signal in signals]
+        }
+        if fold is not None:
+            definition['fold'] = fold
+        return definition
+
+    # Multiplexage : tous les signaux mN partagent la même position, sans mise à l'échelle
+    muxed = [signal for signal in signals if signal['mux'] != 'M']
+    first = muxed[0]
+    for signal in muxed:
+        if signal['mux'] is None:
+            raise ValueError(f"{name}.{signal['name']}: plain signals in multiplexed messages are not supported")
+        if (signal['start'], signal['length'], signal['signed']) != (first['start'], first['length'], first['signed']):
+            raise ValueError(f"{name}.{signal['name']}: multiplexed signals must share one position")
+        if signal['factor'] != 1 or signal['offset'] != 0:
+            raise ValueError(f"{name}.{signal['name']}: multiplexed signals cannot be scaled")
+    return {
+        'id': arbitration_id,
+        'name': name,
+        'layout': _layout(name, [multiplexer[0], first]),
+        'selectors': {str(int(signal['mux'][1:])): signal['name'] for signal in muxed}
+    }
+
+
+def parse_dbc(text):
+    messages = []
+    folds = {}
+    current = None
+    for line in text.splitlines():
+        line = line.strip()
+        match = _MESSAGE.match(line)
+        if match:
+            # Bit 31 : identifiant étendu (29 bits) dans la convention DBC
+            raw = int(match.group(1))
+            current = (raw & 0x1FFFFFFF, match.group(2), [], bool(raw & 0x80000000))
+            messages.append(current)
+            continue
+
+        match = _SIGNAL.match(line)
+        if match and current is not None:
+            name, mux, start, length, order, sign, factor, offset = match.groups()
+            current[2].append({
+                'name': name, 'mux': mux, 'start': int(start), 'length': int(length),
+                'big_endian': order == '0', 'signed': sign == '-',
+                'factor': _number(factor), 'offset': _number(offset)
+            })
+            continue
+
+        match = _FOLD.match(line)
+        if match:
+            folds[int(match.group(1)) & 0x1FFFFFFF] = int(match.group(2))
+
+    definitions = []
+    for arbitration_id, name, signals, extended in messages:
+        if not signals:
+            continue
+        definition = _compile_message(arbitration_id, name, signals, folds.get(arbitration_id))
+        if extended:
+            definition['extended'] = True
+        definitions.append(definition)
+    return definitions
+
+
+def parse_json(text):
+    # Format déclaratif : {"messages": [{"id": "0x12", "layout": ">HH", "signals": [...], "scale": [...]}]}
+    # "extended": true pour un identifiant 29 bits
+    messages = []
+    for message in json.loads(text)['messages']:
+        message = dict(message)
+        if isinstance(message['id'], str):
+            message['id'] = int(message['id'], 0)
+        messages.append(message)
+    return messages
+
+
+def load_definitions(path, cache_dir=DEFAULT_CACHE_DIR):
+    with open(path, 'rb') as f:
+        content = f.read()
+
+    # Le cache est indexé par le hash du fichier : toute modification force une nouvelle analyse
+    cache_file = None
+    if cache_dir is not None:
+        cache_file = os.path.join(cache_dir, f"{hashlib.sha256(content).hexdigest()}.json")
+        try:
+            with open(cache_file) as f:
+                cached = json.load(f)
+            if cached.get('version') == CACHE_VERSION:
+                return cached['messages']
+        except (OSError, ValueError):
+            pass
+
+    text = content.decode('utf-8', errors='replace')
+    messages = parse_dbc(text) if path.lower().endswith('.dbc') else parse_json(text)
+
+    if cache_file is not None:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            temporary = f"{cache_file}.{os.getpid()}.tmp"
+            with open(temporary, 'w') as f:
+                json.dump({'version': CACHE_VERSION, 'source': os.path.abspath(path), 'messages': messages}, f)
+            os.replace(temporary, cache_file)
+        except OSError as e:
+            print(f"Failed to cache signal definitions: {e}")
+    return messages
+
+
+def compile_decoders(messages):
+    decoders = {}
+    for message in messages:
+        if 'selectors' in message:
+            selectors = {int(key): signal for key, signal in message['selectors'].items()}
+            decoders[message['id']] = MultiplexedDecoder(message['layout'], selectors,
+                                                         extended=message.get('extended', False))
+        else:
+            decoders[message['id']] = FrameDecoder(message['layout'], message['signals'],
+                                                   scale=message.get('scale'), offset=message.get('offset'),
+                                                   fold=message.get('fold'),
+                                                   extended=message.get('extended', False))
+    return decoders
+
+
+def load_decoders(path, cache_dir=DEFAULT_CACHE_DIR):
+    return compile_decoders(load_definitions(path, cache_dir))
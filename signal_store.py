@@ -0,0 +1,56 @@
+import threading
+import time
+from collections import namedtuple
+
+SignalValue = namedtuple('SignalValue', ['value', 'timestamp', 'sequence'])
+
+
+class LatestValueStore:
+    def __init__(self, signals=(), default=0):
+        self.default = default
+        self._signals = list(signals)
+        self._values = {}
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    @property
+    def sequence(self):
+        return self._sequence
+
+    def update(self, signal, value, timestamp=None):
+        if timestamp is None:
+            timestamp = time.time()
+        with self._lock:
+            self._sequence += 1
+            self._values[signal] = SignalValue(value, timestamp, self._sequence)
+
+    def update_frame(self, frame):
+        with self._lock:
+            for signal, value in zip(frame.signals, frame.values):
+                self._sequence += 1
+                self._values[signal] = SignalValue(value, frame.timestamp, self._sequence)
+
+    def get(self, signal):
+        return self._values.get(signal)
+
+    def value(self, signal):
+        sample = self._values.get(signal)
+        return self.default if sample is None else sample.value
+
+    def changed_since(self, sequence):
+        # Renvoie aussi le numéro courant pour que l'appelant reparte de là sans trou
+        with self._lock:
+            changes = {signal: sample for signal, sample in self._values.items()
+                       if sample.sequence > sequence}
+            return changes, self._sequence
+
+    def snapshot(self):
+        with self._lock:
+            data = dict.fromkeys(self._signals, self.default)
+            for signal, sample in self._values.items():
+                data[signal] = sample.value
+            return data
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
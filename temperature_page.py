@@ -2,13 +2,24 @@ import tkinter as tk
 from tkinter import ttk
 import math
 
+TEMP_MIN = -20
+TEMP_MAX = 60
+TEMP_STEPS = 10  # résolution de la table de couleurs : 0.1 °C
+THERMO_WIDTH = 80
+THERMO_HEIGHT = 300
+
 class TemperaturePage(tk.Frame):
     def __init__(self, parent):
         super().__init__(parent, bg='#0a0a0a')
         self.temp = 0
         self.pressure = 0
+        self.dirty = True
+        self.color_table = [self._temp_color(TEMP_MIN + i / TEMP_STEPS)
+                            for i in range((TEMP_MAX - TEMP_MIN) * TEMP_STEPS + 1)]
+        self._static_size = None
+        self._mercury = None
+        self._drawn_state = None
         self.create_widgets()
-        self.update_temp()
 
     def create_widgets(self):
         main_frame = tk.Frame(self, bg='#0a0a0a')
@@ -89,48 +100,56 @@ class TemperaturePage(tk.Frame):
         self.thermo_canvas = tk.Canvas(visualization_frame, width=400, height=400, bg='#111111', 
                                       highlightthickness=2, highlightbackground='#FF4444')
         self.thermo_canvas.pack(expand=True, pady=20)
+        self.thermo_canvas.bind('<Configure>', self._on_resize)
+
+    def _on_resize(self, event):
+        self.dirty = True
 
     def set_temp(self, value):
-        self.temp = value
+        if value != self.temp:
+            self.temp = value
+            self.dirty = True
     
     def set_pressure(self, value):
-        self.pressure = value
+        if value != self.pressure:
+            self.pressure = value
+            self.dirty = True
+
+    def render(self):
+        self.dirty = False
+        self.update_temp()
 
     def update_temp(self):
-        temp_val = max(-20, min(60, self.temp))
+        temp_val = max(TEMP_MIN, min(TEMP_MAX, self.temp))
         pressure_val = max(0, min(100, self.pressure))
-        
-        self.thermo_canvas.delete("all")
-        
+
         width = self.thermo_canvas.winfo_width()
         height = self.thermo_canvas.winfo_height()
-        
-        thermo_width = 80
-        thermo_height = 300
-        thermo_x = (width - thermo_width) // 2
-        thermo_y = (height - thermo_height) // 2
-        
-        self.thermo_canvas.create_rectangle(thermo_x, thermo_y, 
-                                          thermo_x + thermo_width, thermo_y + thermo_height,
-                                          fill='#2a2a2a', outline='#ffffff', width=2)
-        
-        temp_range = 80
-        temp_height = int((temp_val + 20) / temp_range * thermo_height)
-        temp_y = thermo_y + thermo_height - temp_height
-        
-        hue = 240 - (temp_val + 20) * 3
-        r, g, b = self.hsv_to_rgb(hue, 1, 1)
-        color = f'#{int(r*255):02x}{int(g*255):02x}{int(b*255):02x}'
-        
-        self.thermo_canvas.create_rectangle(thermo_x, temp_y, 
-                                          thermo_x + thermo_width, thermo_y + thermo_height,
-                                          fill=color, outline='')
-        
-        for i in range(0, 81, 10):
-            y_pos = thermo_y + thermo_height - (i / temp_range * thermo_height)
-            self.thermo_canvas.create_line(thermo_x - 10, y_pos, thermo_x, y_pos, fill='#ffffff', width=1)
-            self.thermo_canvas.create_text(thermo_x - 15, y_pos, text=str(i-20), fill='#ffffff', 
-                                         font=('Arial', 10))
+
+        drawn = (temp_val, pressure_val, width, height)
+        if drawn == self._drawn_state:
+            return
+        self._drawn_state = drawn
+
+        thermo_x = (width - THERMO_WIDTH) // 2
+        thermo_y = (height - THERMO_HEIGHT) // 2
+        if self._static_size != (width, height):
+            self._draw_static(thermo_x, thermo_y)
+            self._static_size = (width, height)
+
+        temp_range = TEMP_MAX - TEMP_MIN
+        temp_height = int((temp_val - TEMP_MIN) / temp_range * THERMO_HEIGHT)
+        temp_y = thermo_y + THERMO_HEIGHT - temp_height
+        color = self.color_table[round((temp_val - TEMP_MIN) * TEMP_STEPS)]
+
+        # La colonne est un seul élément : seuls ses coords et sa couleur changent
+        coords = (thermo_x, temp_y, thermo_x + THERMO_WIDTH, thermo_y + THERMO_HEIGHT)
+        if self._mercury is None:
+            self._mercury = self.thermo_canvas.create_rectangle(*coords, fill=color, outline='')
+        else:
+            self.thermo_canvas.coords(self._mercury, *coords)
+            self.thermo_canvas.itemconfigure(self._mercury, fill=color)
+            self.thermo_canvas.tag_raise(self._mercury, 'static')
         
         self.temp_value_label.config(text=f"{temp_val:.1f}")
         self.pressure_value_label.config(text=f"{pressure_val:.1f}")
@@ -138,8 +157,26 @@ class TemperaturePage(tk.Frame):
         state = "HOT" if temp_val > 35 else "WARM" if temp_val > 15 else "COLD"
         state_color = "#FF4444" if temp_val > 35 else "#FF9800" if temp_val > 15 else "#4FC3F7"
         self.state_value_label.config(text=state, fg=state_color)
-        
-        self.after(50, self.update_temp)
+
+    def _draw_static(self, thermo_x, thermo_y):
+        # Corps, graduations et libellés : reconstruits seulement quand le canevas change de taille
+        self.thermo_canvas.delete('static')
+        self.thermo_canvas.create_rectangle(thermo_x, thermo_y,
+                                            thermo_x + THERMO_WIDTH, thermo_y + THERMO_HEIGHT,
+                                            fill='#2a2a2a', outline='#ffffff', width=2, tags='static')
+
+        temp_range = TEMP_MAX - TEMP_MIN
+        for i in range(0, temp_range + 1, 10):
+            y_pos = thermo_y + THERMO_HEIGHT - (i / temp_range * THERMO_HEIGHT)
+            self.thermo_canvas.create_line(thermo_x - 10, y_pos, thermo_x, y_pos, fill='#ffffff', width=1,
+                                           tags='static')
+            self.thermo_canvas.create_text(thermo_x - 15, y_pos, text=str(i + TEMP_MIN), fill='#ffffff',
+                                           font=('Arial', 10), tags='static')
+
+    def _temp_color(self, temp_val):
+        hue = 240 - (temp_val - TEMP_MIN) * 3
+        r, g, b = self.hsv_to_rgb(hue, 1, 1)
+        return f'#{int(r*255):02x}{int(g*255):02x}{int(b*255):02x}'
 
     def hsv_to_rgb(self, h, s, v):
         h = max(0, min(360, h))
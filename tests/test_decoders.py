@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from can_reading import DEFAULT_DECODERS, FrameDecoder, MultiplexedDecoder
+
+
+def random_payloads(count, seed=0):
+    return np.random.default_rng(seed).integers(0, 256, size=(count, 8), dtype=np.uint8)
+
+
+def assert_batch_matches_scalar(decoder, data):
+    expected = {}
+    for i, payload in enumerate(data):
+        decoded = decoder.decode(payload.tobytes())
+        if decoded is None:
+            continue
+        for signal, value in zip(*decoded):
+            expected.setdefault(signal, ([], []))
+            expected[signal][0].append(i)
+            expected[signal][1].append(value)
+
+    columns = decoder.decode_batch(data)
+    assert {signal for signal, _, _ in columns} == set(expected)
+    for signal, index, values in columns:
+        rows, scalar = expected[signal]
+        if index is not None:
+            np.testing.assert_array_equal(index, rows)
+        np.testing.assert_array_equal(values, np.array(scalar))
+
+
+@pytest.mark.parametrize('arbitration_id', sorted(DEFAULT_DECODERS))
+def test_default_decoders_batch_matches_scalar(arbitration_id):
+    assert_batch_matches_scalar(DEFAULT_DECODERS[arbitration_id], random_payloads(500))
+
+
+@pytest.mark.parametrize('decoder', [
+    FrameDecoder('>B', ['temperature'], offset=[-40]),
+    FrameDecoder('>H', ['speed'], offset=[100]),
+    FrameDecoder('<hH', ['torque', 'current'], scale=[0.1, 2], offset=[-3200, 7]),
+    FrameDecoder('>bI', ['angle', 'distance'], scale=[0.5, 0.001], offset=[1.5, -0.25]),
+    FrameDecoder('>HH', ['alpha', 'theta'], scale=[0.01, 1], offset=[-1, 0], fold=128),
+    MultiplexedDecoder('<Bh', {0: 'low', 1: 'high'}),
+])
+def test_offset_and_signed_batch_matches_scalar(decoder):
+    data = random_payloads(500, seed=1)
+    # Quelques valeurs extrêmes pour les débordements du type brut
+    data[:2] = 0xFF
+    data[2:4] = 0x00
+    if isinstance(decoder, MultiplexedDecoder):
+        # Sélecteurs connus et inconnus (2)
+        data[:, 0] %= 3
+    assert_batch_matches_scalar(decoder, data)
+
+
+def test_unsigned_byte_with_negative_offset():
+    decoder = FrameDecoder('>B', ['temperature'], offset=[-40])
+    (_, _, values), = decoder.decode_batch(np.array([[10, 0, 0, 0, 0, 0, 0, 0]], dtype=np.uint8))
+    assert values.tolist() == [-30]
@@ -0,0 +1,84 @@
+import os
+
+import numpy as np
+import pytest
+
+from can_reading import DEFAULT_DECODERS, FrameDecoder, decode_batch
+from signal_definitions import compile_decoders, load_decoders, parse_dbc
+
+SENSORS_DBC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'sensors.dbc')
+
+# Signaux signés et avec offset, absents de sensors.dbc
+SIGNED_DBC = """
+BO_ 64 Engine: 8 Sensors
+ SG_ coolant : 7|8@0+ (1,-40) [-40|215] "degC" HMI
+ SG_ torque : 15|16@0- (0.1,-10) [-3286.8|3266.7] "Nm" HMI
+ SG_ speed : 39|16@0+ (1,100) [100|65635] "rpm" HMI
+
+BO_ 65 Chassis: 6 Sensors
+ SG_ yaw : 0|16@1- (0.01,0.5) [-327.18|328.17] "deg/s" HMI
+ SG_ load : 16|32@1+ (1,-1000) [-1000|4294966295] "N" HMI
+"""
+
+SIGNED_REFERENCE = {
+    0x40: FrameDecoder('>BhxH', ['coolant', 'torque', 'speed'], scale=[1, 0.1, 1], offset=[-40, -10, 100]),
+    0x41: FrameDecoder('<hI', ['yaw', 'load'], scale=[0.01, 1], offset=[0.5, -1000]),
+}
+
+
+def random_frames(ids, count=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    frames = np.zeros(count, dtype=[('timestamp', 'f8'), ('arbitration_id', 'u4'), ('dlc', 'u1'),
+                                     ('data', 'u1', (8,))])
+    frames['timestamp'] = np.arange(count) * 0.001
+    frames['arbitration_id'] = rng.choice(sorted(ids), size=count)
+    frames['dlc'] = rng.integers(0, 9, size=count)
+    frames['data'] = rng.integers(0, 256, size=(count, 8))
+    # Sélecteurs de multiplexage connus et inconnus pour 0x11
+    frames['data'][:, 1] %= 3
+    return frames
+
+
+def assert_same_decoding(decoders, reference, frames):
+    assert sorted(decoders) == sorted(reference)
+    for frame in frames:
+        payload = frame['data'][:frame['dlc']].tobytes()
+        arbitration_id = int(frame['arbitration_id'])
+        assert decoders[arbitration_id].decode(payload) == reference[arbitration_id].decode(payload)
+
+    batch = decode_batch(frames, decoders)
+    expected = decode_batch(frames, reference)
+    assert sorted(batch) == sorted(expected)
+    for signal, (timestamps, values) in expected.items():
+        np.testing.assert_array_equal(batch[signal][0], timestamps)
+        np.testing.assert_array_equal(batch[signal][1], values)
+
+
+def test_sensors_dbc_matches_default_decoders():
+    decoders = load_decoders(SENSORS_DBC, cache_dir=None)
+    assert_same_decoding(decoders, DEFAULT_DECODERS, random_frames(DEFAULT_DECODERS))
+
+
+def test_signed_and_offset_signals_match_hand_written_decoders():
+    decoders = compile_decoders(parse_dbc(SIGNED_DBC))
+    assert_same_decoding(decoders, SIGNED_REFERENCE, random_frames(SIGNED_REFERENCE, seed=1))
+
+
+@pytest.mark.parametrize('arbitration_id', sorted(SIGNED_REFERENCE))
+def test_signed_and_offset_batch_matches_scalar(arbitration_id):
+    decoder = compile_decoders(parse_dbc(SIGNED_DBC))[arbitration_id]
+    frames = random_frames([arbitration_id], seed=2)
+    frames['dlc'] = 8
+    frames['data'][:2] = 0xFF
+    timestamps, columns = frames['timestamp'], decode_batch(frames, {arbitration_id: decoder})
+    for i, signal in enumerate(decoder.signals):
+        scalar = [decoder.decode(payload.tobytes())[1][i] for payload in frames['data']]
+        np.testing.assert_array_equal(columns[signal][0], timestamps)
+        np.testing.assert_array_equal(columns[signal][1], np.array(scalar))
+
+
+def test_extended_identifier_is_kept():
+    message, = parse_dbc('BO_ 2566848528 Ext: 2 Sensors\n SG_ value : 7|16@0+ (1,0) [0|65535] "" HMI\n')
+    assert message['id'] == 0x18FF0010
+    assert message['extended'] is True
+    assert compile_decoders([message])[0x18FF0010].extended
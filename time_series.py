@@ -0,0 +1,100 @@
+import threading
+
+import numpy as np
+
+
+class TimeSeriesBuffer:
+    def __init__(self, capacity=100000, dtype='f8'):
+        self.capacity = capacity
+        # Chaque échantillon est écrit deux fois (i et i + capacity) : n'importe quelle
+        # fenêtre des derniers points est alors une tranche contiguë, donc une vue sans copie
+        self._timestamps = np.zeros(2 * capacity, dtype='f8')
+        self._values = np.zeros(2 * capacity, dtype=dtype)
+        self._head = 0
+        self._count = 0
+        self.total = 0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, timestamp, value):
+        head = self._head
+        self._timestamps[head] = self._timestamps[head + self.capacity] = timestamp
+        self._values[head] = self._values[head + self.capacity] = value
+        self._head = (head + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+        self.total += 1
+
+    def extend(self, timestamps, values):
+        timestamps = np.asarray(timestamps, dtype='f8')
+        values = np.asarray(values)
+        n = len(timestamps)
+        if n > self.capacity:
+            timestamps, values = timestamps[-self.capacity:], values[-self.capacity:]
+            self.total += n - self.capacity
+            n = self.capacity
+
+        index = (self._head + np.arange(n)) % self.capacity
+        self._timestamps[index] = self._timestamps[index + self.capacity] = timestamps
+        self._values[index] = self._values[index + self.capacity] = values
+        self._head = (self._head + n) % self.capacity
+        self._count = min(self.capacity, self._count + n)
+        self.total += n
+
+    def window(self, n=None):
+        # Vues valides jusqu'au prochain append qui recouvre la fenêtre
+        if n is None or n > self._count:
+            n = self._count
+        end = self._head + self.capacity
+        return self._timestamps[end - n:end], self._values[end - n:end]
+
+    def since(self, timestamp):
+        timestamps, values = self.window()
+        start = np.searchsorted(timestamps, timestamp, side='left')
+        return timestamps[start:], values[start:]
+
+    def last(self):
+        if not self._count:
+            return None
+        index = (self._head - 1) % self.capacity
+        return self._timestamps[index], self._values[index]
+
+    def clear(self):
+        self._head = 0
+        self._count = 0
+
+
+class TimeSeriesStore:
+    def __init__(self, capacity=100000):
+        self.capacity = capacity
+        self.series = {}
+        self._lock = threading.Lock()
+
+    def get(self, signal):
+        buffer = self.series.get(signal)
+        if buffer is None:
+            with self._lock:
+                buffer = self.series.setdefault(signal, TimeSeriesBuffer(self.capacity))
+        return buffer
+
+    def append(self, signal, timestamp, value):
+        self.get(signal).append(timestamp, value)
+
+    def append_frame(self, frame):
+        for signal, value in zip(frame.signals, frame.values):
+            self.get(signal).append(frame.timestamp, value)
+
+    def extend(self, columns):
+        for signal, (timestamps, values) in columns.items():
+            self.get(signal).extend(timestamps, values)
+
+    def window(self, signal, n=None):
+        return self.get(signal).window(n)
+
+    def signals(self):
+        return list(self.series)
+
+    def clear(self):
+        for buffer in self.series.values():
+            buffer.clear()
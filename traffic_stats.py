@@ -0,0 +1,195 @@
+import os
+import threading
+import time
+
+KERNEL_COUNTERS = ('rx_packets', 'rx_bytes', 'rx_dropped', 'rx_over_errors', 'rx_fifo_errors', 'rx_errors',
+                   'tx_packets', 'tx_bytes', 'tx_dropped')
+
+
+def frame_bits(dlc, extended=False):
+    # Longueur sur le fil avec le pire cas de bit stuffing (Davis et al.), en-têtes et fin de trame compris
+    if extended:
+        return 67 + 8 * dlc + (54 + 8 * dlc - 1) // 4
+    return 47 + 8 * dlc + (34 + 8 * dlc - 1) // 4
+
+
+def bus_bits(packets, data_bytes):
+    # Même estimation que frame_bits, agrégée sur des compteurs (trames standard)
+    return 47 * packets + 8 * data_bytes + (34 * packets + 8 * data_bytes) // 4
+
+
+def kernel_counters(channel):
+    # Compteurs du pilote SocketCAN ; absents pour les bus virtuels et hors Linux
+    directory = f"/sys/class/net/{channel}/statistics"
+    if not os.path.isdir(directory):
+        return None
+    counters = {}
+    for name in KERNEL_COUNTERS:
+        try:
+            with open(os.path.join(directory, name)) as f:
+                counters[name] = int(f.read())
+        except (OSError, ValueError):
+            pass
+    return counters
+
+
+class InterfaceLoad:
+    # Charge totale du bus d'après les compteurs de l'interface, trafic filtré compris
+    def __init__(self, channel, bitrate=500000, interval=1.0, clock=time.monotonic):
+        self.channel = channel
+        self.bitrate = bitrate
+        self.interval = interval
+        self.clock = clock
+        self.bus_load = None
+        self.frames_per_s = None
+        self._previous = None
+
+    def sample(self):
+        counters = kernel_counters(self.channel)
+        if counters is None or 'rx_packets' not in counters:
+            return None
+
+        now = self.clock()
+        packets = counters['rx_packets'] + counters.get('tx_packets', 0)
+        data_bytes = counters.get('rx_bytes', 0) + counters.get('tx_bytes', 0)
+        if self._previous is None:
+            self._previous = (now, packets, data_bytes)
+            self.bus_load, self.frames_per_s = 0.0, 0.0
+        elif now - self._previous[0] >= self.interval:
+            # Plusieurs lecteurs peuvent appeler sample() : le delta n'avance qu'une fois par intervalle
+            elapsed = now - self._previous[0]
+            delta_packets = packets - self._previous[1]
+            delta_bytes = data_bytes - self._previous[2]
+            self.bus_load = bus_bits(delta_packets, delta_bytes) / (self.bitrate * elapsed) * 100
+            self.frames_per_s = delta_packets / elapsed
+            self._previous = (now, packets, data_bytes)
+        return {'bus_load_pct': self.bus_load, 'frames_per_s': self.frames_per_s}
+
+
+class IdStats:
+    __slots__ = ('count', 'last_timestamp', 'mean_interval', 'jitter', 'gaps', 'max_gap',
+                 'gap_run', 'gap_run_max', 'length_errors', 'dlc')
+
+    def __init__(self):
+        self.count = 0
+        self.last_timestamp = None
+        self.mean_interval = 0.0
+        self.jitter = 0.0
+        self.gaps = 0
+        self.max_gap = 0.0
+        self.gap_run = 0
+        self.gap_run_max = 0.0
+        self.length_errors = 0
+        self.dlc = 0
+
+
+class TrafficStats:
+    def __init__(self, bitrate=500000, window=1.0, gap_factor=3.0, warmup=10, rebaseline=5,
+                 clock=time.monotonic):
+        self.bitrate = bitrate
+        self.clock = clock
+        self.window = window
+        self.gap_factor = gap_factor
+        self.warmup = warmup
+        self.rebaseline = rebaseline
+
+        self.ids = {}
+        self.frames = 0
+        self.accepted_load = 0.0
+        self.frames_per_s = 0.0
+        self._window_start = None
+        self._window_bits = 0
+        self._window_frames = 0
+        self._last_arrival = None
+        self._lock = threading.Lock()
+
+    def record(self, message, expected_size=None):
+        timestamp = message.timestamp
+        dlc = len(message.data)
+        with self._lock:
+            stats = self.ids.get(message.arbitration_id)
+            if stats is None:
+                stats = self.ids[message.arbitration_id] = IdStats()
+
+            # Horloge qui recule (rejeu en boucle) : l'intervalle est ignoré
+            if stats.last_timestamp is not None and timestamp >= stats.last_timestamp:
+                interval = timestamp - stats.last_timestamp
+                if stats.count > self.warmup and interval > self.gap_factor * stats.mean_interval:
+                    # Trou en attente de confirmation : plusieurs d'affilée signifient que la période a changé
+                    stats.gap_run += 1
+                    stats.gap_run_max = max(stats.gap_run_max, interval)
+                    if stats.gap_run >= self.rebaseline:
+                        stats.mean_interval = interval
+                        stats.jitter = 0.0
+                        stats.gap_run = 0
+                        stats.gap_run_max = 0.0
+                else:
+                    if stats.gap_run:
+                        stats.gaps += stats.gap_run
+                        stats.max_gap = max(stats.max_gap, stats.gap_run_max)
+                        stats.gap_run = 0
+                        stats.gap_run_max = 0.0
+                    # Moyenne glissante et gigue façon RFC 3550 (gain 1/16), hors trous
+                    deviation = interval - stats.mean_interval
+                    stats.mean_interval += deviation / 16 if stats.count > 1 else deviation
+                    stats.jitter += (abs(deviation) - stats.jitter) / 16
+            stats.last_timestamp = timestamp
+            stats.count += 1
+            stats.dlc = dlc
+            if expected_size is not None and dlc < expected_size:
+                stats.length_errors += 1
+
+            # Charge des IDs acceptés par les filtres sur une fenêtre glissante, dans l'horloge des trames
+            self.frames += 1
+            self._last_arrival = self.clock()
+            if self._window_start is None or timestamp < self._window_start:
+                self._window_start = timestamp
+                self._window_bits = 0
+                self._window_frames = 0
+            self._window_bits += frame_bits(dlc, message.is_extended_id)
+            self._window_frames += 1
+            elapsed = timestamp - self._window_start
+            if elapsed >= self.window:
+                self.accepted_load = self._window_bits / (self.bitrate * elapsed) * 100
+                self.frames_per_s = self._window_frames / elapsed
+                self._window_start = timestamp
+                self._window_bits = 0
+                self._window_frames = 0
+
+    def summary(self, now=None):
+        if now is None:
+            now = time.time()
+        with self._lock:
+            ids = {}
+            for arbitration_id, stats in sorted(self.ids.items()):
+                ids[arbitration_id] = {
+                    'count': stats.count,
+                    'frames_per_s': 1 / stats.mean_interval if stats.mean_interval > 0 else 0.0,
+                    'jitter_ms': stats.jitter * 1000,
+                    'age_s': now - stats.last_timestamp,
+                    'gaps': stats.gaps + stats.gap_run,
+                    'max_gap_ms': max(stats.max_gap, stats.gap_run_max) * 1000,
+                    'length_errors': stats.length_errors,
+                    'dlc': stats.dlc
+                }
+            # Sans trame depuis une fenêtre complète, le bus est au repos : pas de dernière valeur figée
+            idle = self._last_arrival is None or self.clock() - self._last_arrival > self.window
+            return {
+                'frames': self.frames,
+                'frames_per_s': 0.0 if idle else self.frames_per_s,
+                'accepted_load_pct': 0.0 if idle else self.accepted_load,
+                'gaps': sum(s['gaps'] for s in ids.values()),
+                'length_errors': sum(s['length_errors'] for s in ids.values()),
+                'ids': ids
+            }
+
+    def reset(self):
+        with self._lock:
+            self.ids.clear()
+            self.frames = 0
+            self.accepted_load = 0.0
+            self.frames_per_s = 0.0
+            self._window_start = None
+            self._window_bits = 0
+            self._window_frames = 0
+            self._last_arrival = None